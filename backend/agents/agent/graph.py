@@ -7,9 +7,16 @@ from langchain_core.messages import AIMessage
 from core.config import settings
 
 from agents.agent.tools import TOOLS
-from agents.agent.utils import load_chat_model
+from agents.agent.utils import load_chat_model, supports_cache_control
 from agents.agent.state import InputState, State
-from agents.agent.prompts import ORCHESTRATOR_SYSTEM_PROMPT
+from agents.agent.prompts import ORCHESTRATOR_TEMPLATE
+from agents.agent.router import fast_route_message
+
+# The orchestrator prompt has no per-call inputs. Rendering it once keeps the
+# system prefix byte-identical across calls, so provider prefix caches hit.
+SYSTEM_PROMPT_BLOCKS = ORCHESTRATOR_TEMPLATE.render_blocks(
+    cache_control=supports_cache_control(settings.GEMINI_MODEL)
+)
 
 
 async def call_model(state: State) -> dict[str, list[AIMessage]]:
@@ -24,17 +31,20 @@ async def call_model(state: State) -> dict[str, list[AIMessage]]:
     Returns:
         dict: A dictionary containing the model's response message.
     """
+    # Requests like "show this as a timeline" map straight to a tool call
+    if settings.FAST_ROUTING:
+        routed = fast_route_message(state.messages)
+        if routed is not None:
+            return {"messages": [routed]}
+
     # Initialize the model with tool binding. Change the model or add more tools here.
     model = load_chat_model(settings.GEMINI_MODEL).bind_tools(TOOLS)
 
-    # Format the system prompt. Customize this to change the agent's behavior.
-    system_message = ORCHESTRATOR_SYSTEM_PROMPT
-
     # Get the model's response
     response = cast(
         "AIMessage",
         await model.ainvoke(
-            [{"role": "system", "content": system_message}, *state.messages]
+            [{"role": "system", "content": SYSTEM_PROMPT_BLOCKS}, *state.messages]
         ),
     )
 
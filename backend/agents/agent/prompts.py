@@ -1,66 +1,258 @@
+"""Prompt templates for the orchestrator and the visualization tools."""
+
+import re
+import textwrap
+from types import MappingProxyType
+from typing import Any
+
+import orjson
+
+from core.config import settings
+
+__all__ = [
+    "ORCHESTRATOR_SYSTEM_PROMPT",
+    "MINDMAP_PROMPT",
+    "SEQUENCE_PROMPT",
+    "MINDMAP_MOD_PROMPT",
+    "MODIFICATION_PROMPT",
+    "MOD_PROMPT_NODE",
+    "KNOWLEDGE_GRAPH_PROMPT",
+    "TIMELINE_PROMPT",
+    "PROMPTS",
+    "PROMPT_BYTES",
+    "TOPIC_PLACEHOLDER",
+    "JSON_PLACEHOLDER",
+    "REQUEST_PLACEHOLDER",
+    "EPHEMERAL_CACHE_CONTROL",
+    "PromptTemplate",
+    "ORCHESTRATOR_TEMPLATE",
+    "MINDMAP_TEMPLATE",
+    "SEQUENCE_TEMPLATE",
+    "KNOWLEDGE_GRAPH_TEMPLATE",
+    "TIMELINE_TEMPLATE",
+    "MINDMAP_MOD_TEMPLATE",
+    "MODIFICATION_TEMPLATE",
+    "MOD_NODE_TEMPLATE",
+]
+
+# ---------------------------------------------------------------------------
+# Output examples
+# ---------------------------------------------------------------------------
+# The example payloads shown to the model are kept as Python data and
+# serialized once at import, so they are always valid JSON and render compactly.
+
+_MINDMAP_EXAMPLE = {
+    "metadata": {"topic": "...", "contentType": "mindmap", "nodeCount": 0},
+    "nodes": [
+        {
+            "id": "root",
+            "data": {
+                "label": "Main Topic",
+                "type": "root",
+                "summary": "Central overview (2-3 sentences).",
+                "hoverSummary": "Short one-liner.",
+            },
+        },
+        {
+            "id": "cat1",
+            "data": {
+                "label": "Category",
+                "type": "category",
+                "summary": "Branch explanation (2-3 sentences).",
+                "hoverSummary": "Short one-liner.",
+            },
+        },
+        {
+            "id": "leaf1",
+            "data": {
+                "label": "Detail",
+                "type": "leaf",
+                "summary": "Specific fact (2-3 sentences).",
+                "hoverSummary": "Short one-liner.",
+            },
+        },
+    ],
+    "edges": [
+        {"id": "e1", "source": "root", "target": "cat1", "type": "connects"},
+        {"id": "e2", "source": "cat1", "target": "leaf1", "type": "connects"},
+    ],
+    "hierarchy": {"root": ["cat1"], "cat1": ["leaf1"]},
+}
+
+_SEQUENCE_EXAMPLE = {
+    "metadata": {
+        "title": "Sequence Diagram Title",
+        "summary": "Detailed summary (2-3 sentences).",
+    },
+    "participants": [
+        {
+            "id": "user",
+            "label": "Customer",
+            "type": "Actor",
+            "description": "End user initiating the flow.",
+        },
+        {
+            "id": "api",
+            "label": "API Gateway",
+            "type": "Participant",
+            "description": "Main entry point.",
+        },
+    ],
+    "activations": [{"participant": "api", "startStep": 1, "endStep": 2}],
+    "fragments": [
+        {
+            "type": "alt",
+            "condition": "Invalid Token",
+            "startStep": 1,
+            "endStep": 2,
+            "label": "Alternative Flow",
+        }
+    ],
+    "events": [
+        {
+            "step": 1,
+            "type": "message",
+            "source": "user",
+            "target": "api",
+            "label": "POST /login",
+            "arrowType": "solid",
+            "lineType": "solid",
+        },
+        {
+            "step": 2,
+            "type": "message",
+            "source": "api",
+            "target": "user",
+            "label": "200 OK (Token)",
+            "arrowType": "open_arrow",
+            "lineType": "dotted",
+        },
+    ],
+}
+
+_KNOWLEDGE_GRAPH_EXAMPLE = {
+    "metadata": {
+        "projectName": "Project Title",
+        "description": "Short description of the visualization.",
+        "version": "1.0",
+        "author": "AI",
+        "topic": "slug-format",
+        "contentType": "educational",
+    },
+    "nodes": [
+        {
+            "id": "root-id",
+            "data": {
+                "label": "Main Topic Name",
+                "type": "data",
+                "description": "Short description.",
+                "summary": "Detailed, informative summary (2-3 sentences) explaining the main topic concept.",
+            },
+        },
+        {
+            "id": "category-id",
+            "data": {
+                "label": "Category Name",
+                "type": "backend",
+                "description": "Short description of this category.",
+                "summary": "Detailed summary explaining what this category encompasses.",
+            },
+        },
+        {
+            "id": "item-id",
+            "data": {
+                "label": "Specific Item Name",
+                "type": "frontend",
+                "description": "Short description.",
+                "summary": "Detailed summary explaining this specific item.",
+                "characteristics": ["Trait 1", "Trait 2"],
+                "examples": ["Ex 1", "Ex 2"],
+            },
+        },
+    ],
+    "hierarchy": {
+        "root-id": ["category-1-id", "category-2-id"],
+        "category-1-id": ["item-a-id", "item-b-id"],
+    },
+    "edges": [
+        {
+            "id": "e1",
+            "source": "root-id",
+            "target": "category-1-id",
+            "type": "establishes",
+        },
+        {
+            "id": "e2",
+            "source": "category-1-id",
+            "target": "item-a-id",
+            "type": "involves",
+        },
+    ],
+    "details": {},
+}
+
+_TIMELINE_EXAMPLE = {
+    "chartType": "timeline",
+    "metadata": {
+        "title": "String (Title of the timeline)",
+        "summary": "String (4-6 sentences explaining the context and significance of the timeline)",
+    },
+    "events": [
+        {
+            "era": "String (The major time period, e.g., 'Pre-War')",
+            "year": "String (Year or Date)",
+            "name": "String (Max 4 words)",
+            "summary": "String (1 sentence for immediate understanding of the event)",
+            "description": "String (3-4 sentences explaining the context and significance of the event)",
+        }
+    ],
+    "mermaid_syntax": "String (The raw Mermaid code)",
+}
+
+
+def _json_example(example: dict[str, Any]) -> str:
+    """Serialize an output example for embedding in a prompt."""
+    option = orjson.OPT_INDENT_2 if settings.PROMPTS_PRETTY else 0
+    return orjson.dumps(example, option=option).decode()
+
+
 ORCHESTRATOR_SYSTEM_PROMPT = """
-<system_instruction>
-    <role>Visualization Orchestrator</role>
-    <purpose>Manage a single-topic visualization session with strict tool execution and topic enforcement.</purpose>
-
-    <topic_management>
-        <rule_initial_topic>
-            The first topic provided by the user is the "current_topic". 
-            Action: Immediately call create_mindmap for this topic.
-        </rule_initial_topic>
-        <rule_topic_drift>
-            Compare every subsequent message to the "current_topic". 
-            If the user introduces a new, unrelated topic, you must STOP and output exactly:
-            ERROR: New topic detected. Please start a new chat for a different topic.
-        </rule_topic_drift>
-    </topic_management>
-
-    <workflow_logic>
-        <state_first_message>
-            If no visualization exists: Use create_mindmap. AFTER the tool executes and returns, DO NOT call another tool. 
-            Instead, respond with a brief confirmation that the mindmap has been created.
-        </state_first_message>
-        <state_modifications>
-            If the user asks to "modify", "add", "remove", "update", or "change" an existing visual: 
-            Use modify_visualization. AFTER the tool executes, respond with a confirmation. Do not chain additional tools.
-        </state_modifications>
-        <state_new_structure>
-            If the user explicitly asks for a different structure (even if it's the same topic):
-            - "timeline" / "history" / "chronology" -> create_timeline
-            - "graph" / "hierarchy" / "network" / "categories" -> create_knowledge_graph
-            - "steps" / "process" / "flow" -> create_sequence_diagram
-            AFTER any of these tools execute, respond with a brief confirmation. Do not automatically call other tools.
-        </state_new_structure>
-    </workflow_logic>
-
-    <execution_constraints>
-        <constraint>Output ONLY the tool call when you decide to invoke a tool.</constraint>
-        <constraint>After a tool has executed and returned a response, you MUST output text instead of calling another tool.</constraint>
-        <constraint>Use exactly ONE tool per user request.</constraint>
-        <constraint>Do NOT infer actions. Only act on explicit commands (create, show, modify, add, etc.).</constraint>
-        <constraint>If the user message contains no actionable intent or request for visualization, output NOTHING.</constraint>
-        <constraint>CRITICAL: Never chain multiple tool calls. Always wait for explicit user instructions before calling a different tool.</constraint>
-    </execution_constraints>
-
-    <tool_library>
-        <tool name="create_mindmap">Default tool for initial topics.</tool>
-        <tool name="modify_visualization">Used to update or edit any existing diagram.</tool>
-        <tool name="create_timeline">Used for chronological or time-based data.</tool>
-        <tool name="create_knowledge_graph">Used for complex hierarchies or networked information.</tool>
-        <tool name="create_sequence_diagram">Used for step-by-step processes or flows.</tool>
-    </tool_library>
-</system_instruction>
+ROLE: Visualization Orchestrator. Manage a single-topic visualization session with strict tool execution and topic enforcement.
+
+TOPIC MANAGEMENT:
+- The first topic provided by the user is the "current_topic". Immediately call create_mindmap for it.
+- Compare every subsequent message to the "current_topic". If the user introduces a new, unrelated topic, STOP and output exactly:
+ERROR: New topic detected. Please start a new chat for a different topic.
+
+WORKFLOW:
+- No visualization exists yet: use create_mindmap.
+- The user asks to "modify", "add", "remove", "update" or "change" an existing visual: use modify_visualization.
+- The user explicitly asks for a different structure (even on the same topic):
+  - "timeline" / "history" / "chronology" -> create_timeline
+  - "graph" / "hierarchy" / "network" / "categories" -> create_knowledge_graph
+  - "steps" / "process" / "flow" -> create_sequence_diagram
+- After any tool executes and returns, respond with a brief confirmation instead of calling another tool.
+
+CONSTRAINTS:
+- Output ONLY the tool call when you decide to invoke a tool.
+- Use exactly ONE tool per user request. CRITICAL: never chain tool calls; wait for explicit user instructions before calling a different tool.
+- Do NOT infer actions. Only act on explicit commands (create, show, modify, add, etc.).
+- If the user message contains no actionable intent or request for visualization, output NOTHING.
+
+TOOLS:
+- create_mindmap: default tool for initial topics.
+- modify_visualization: update or edit any existing diagram.
+- create_timeline: chronological or time-based data.
+- create_knowledge_graph: complex hierarchies or networked information.
+- create_sequence_diagram: step-by-step processes or flows.
 """
 
-MINDMAP_PROMPT = """
+MINDMAP_PROMPT = (
+    """
 You are an expert Information Architect.
 
 **Task:**
-Generate a structured, flexible hierarchical mind map for the topic provided below.
-The structure should be natural and balanced: Central Idea -> Major Categories -> Sub-categories -> Specific Details.
-You may go up to 3-4 levels deep where appropriate.
-
-**Topic:** {INSERT_TOPIC_HERE}
+Generate a structured, balanced hierarchical mind map for the topic provided below.
 
 **JSON Generation Rules (Strict):**
 1. Output ONLY valid, raw JSON.
@@ -73,8 +265,8 @@ You may go up to 3-4 levels deep where appropriate.
 2. **Level 1 (Categories):** 4-6 distinct, high-level categories (e.g., "History", "Origin", "Uses").
 3. **Level 2+ (Sub-categories/Leaves):** Recursively break down complex categories into sub-categories. Ensure you reach 3-4 levels of depth where necessary.
 4. **Leaves:** The final nodes should be specific examples or facts.
-4. **Labels:** Keep `label` short (1-4 words).
-5. **Summaries:** Ensure the "summary" fields are detailed and informative.
+5. **Labels:** Keep `label` short (1-4 words).
+6. **Summaries:** Ensure the "summary" fields are detailed and informative.
 
 **Schema Requirements:**
 Use this EXACT JSON structure.
@@ -82,35 +274,23 @@ Use this EXACT JSON structure.
 - Ensure `hierarchy` matches `edges`.
 
 **Output Structure:**
-{
-  "metadata": { "topic": "...", "contentType": "mindmap", "nodeCount": 0 },
-  "nodes": [
-    { "id": "root", "data": { "label": "Main Topic", "type": "root", "summary": "Central overview (2-3 sentences).", "hoverSummary": "Short one-liner." } },
-    { "id": "cat1", "data": { "label": "Category", "type": "category", "summary": "Branch explanation (2-3 sentences).", "hoverSummary": "Short one-liner." } },
-    { "id": "leaf1", "data": { "label": "Detail", "type": "leaf", "summary": "Specific fact (2-3 sentences).", "hoverSummary": "Short one-liner." } }
-  ],
-  "edges": [
-    { "id": "e1", "source": "root", "target": "cat1", "type": "connects" },
-    { "id": "e2", "source": "cat1", "target": "leaf1", "type": "connects" }
-  ],
-  "hierarchy": {
-    "root": ["cat1"],
-    "cat1": ["leaf1"]
-  }
-}
+"""
+    + _json_example(_MINDMAP_EXAMPLE)
+    + """
 
 **Constraint Checklist:**
 - Generate approximately 20-30 nodes total.
-- Flexible depth (Root -> Category -> Sub-category -> Leaf).
 - Ensure every ID in `edges` and `hierarchy` exists in `nodes`.
 
-
+**Topic:** {INSERT_TOPIC_HERE}
 """
+)
 
-SEQUENCE_PROMPT = """
+SEQUENCE_PROMPT = (
+    """
 Role: You are a System Architect. Your goal is to design a clear, logical sequence of interactions for a given process.
 
-Task: Generate a JSON object for the sequence: {INSERT_TOPIC_HERE}.
+Task: Generate a JSON object for the sequence given at the end of this prompt.
 
 Rules:
 1. Participants: Identify key actors (type="Actor") and systems (type="Participant").
@@ -141,58 +321,9 @@ Mandatory Logic Requirements:
 
 JSON Schema: Return ONLY valid JSON.
 ```json
-{
-  "metadata": {
-  "title": "Sequence Diagram Title",
-    "summary": "Detailed summary (2-3 sentences)."
-  },
-  "participants": [
-    {
-      "id": "user",
-      "label": "Customer",
-      "type": "Actor",
-      "description": "End user initiating the flow."
-    },
-    {
-      "id": "api",
-      "label": "API Gateway",
-      "type": "Participant",
-      "description": "Main entry point."
-    }
-  ],
-  "activations": [
-    {"participant": "api", "startStep": 1, "endStep": 2}
-  ],
-  "fragments": [
-    {
-      "type": "alt",
-      "condition": "Invalid Token",
-      "startStep": 1,
-      "endStep": 2,
-      "label": "Alternative Flow"
-    }
-  ],
-  "events": [
-    {
-      "step": 1,
-      "type": "message",
-      "source": "user",
-      "target": "api",
-      "label": "POST /login",
-      "arrowType": "solid",
-      "lineType": "solid"
-    },
-    {
-      "step": 2,
-      "type": "message",
-      "source": "api",
-      "target": "user",
-      "label": "200 OK (Token)",
-      "arrowType": "open_arrow",
-      "lineType": "dotted"
-    }
-  ]
-}
+"""
+    + _json_example(_SEQUENCE_EXAMPLE)
+    + """
 ```
 
 Requirements:
@@ -202,15 +333,14 @@ Requirements:
 4. **Fragments**: Use the `fragments` array to show logic (e.g., `alt`, `loop`, `opt`). `startStep` and `endStep` define the vertical range.
 5. **Return Messages**: Use `arrowType: "open_arrow"` and `lineType: "dotted"` for responses.
 6. **Complexity**: Ensure at least 3 participants and logical activations.
+
+Sequence: {INSERT_TOPIC_HERE}
 """
+)
 
 MINDMAP_MOD_PROMPT = """
 Role: You are an Expert Information Architect. Task: Modify the provided Mindmap JSON based on the user's request.
 
-Inputs:
-Current JSON: {INSERT_CURRENT_JSON_DATA_HERE}
-User Request: {REQUEST} (e.g., "Add a 'Marketing' branch with 3 strategies", "Delete the 'History' node", "Rename 'Origin' to 'Background'")
-
 Strict Modification Rules:
 1. Output Integrity (CRITICAL): Return the ENTIRE valid JSON object. No diffs, no comments.
 2. Structure Logic:
@@ -227,13 +357,14 @@ Strict Modification Rules:
 
 Response Format:
 Return ONLY valid JSON.
+
+Inputs:
+Current JSON: {INSERT_CURRENT_JSON_DATA_HERE}
+User Request: {REQUEST} (e.g., "Add a 'Marketing' branch with 3 strategies", "Delete the 'History' node", "Rename 'Origin' to 'Background'")
 """
 
 MODIFICATION_PROMPT = """
 Role: You are a Knowledge Graph Architect. Task: Modify the provided Knowledge Graph JSON based on the user's request.
-Inputs:
-Current JSON: {INSERT_CURRENT_JSON_DATA_HERE}
-User Request: {REQUEST} (e.g., "Add a 'Cloud Computing' category with 3 items" or "Delete the 'History' category")
 Strict Modification Rules:
 Output Integrity (CRITICAL): You must return the ENTIRE valid JSON object. Do NOT return diffs, summaries, or comments like // ... rest of code. The output must be ready to copy-paste into a file.
 Hierarchy Maintenance:
@@ -249,7 +380,9 @@ Category (Level 2): type: "backend"
 Item (Level 3): type: "frontend" (or utility if it fits better).
 Smart Descriptions: When adding new nodes, generate a detailed summary (2-3 sentences) automatically. Do not leave it blank.
 Response Format: Return ONLY valid JSON. No markdown text before or after.
-
+Inputs:
+Current JSON: {INSERT_CURRENT_JSON_DATA_HERE}
+User Request: {REQUEST} (e.g., "Add a 'Cloud Computing' category with 3 items" or "Delete the 'History' category")
 """
 
 MOD_PROMPT_NODE = """
@@ -277,10 +410,11 @@ Output format:
 }
 """
 
-KNOWLEDGE_GRAPH_PROMPT = """
+KNOWLEDGE_GRAPH_PROMPT = (
+    """
 Role: You are a Knowledge Graph Architect. Your goal is to create a clean, structured, hierarchical dataset for an interactive visualization.
 
-Task: Generate a JSON object for the topic: "{INSERT_TOPIC_HERE}".
+Task: Generate a JSON object for the topic given at the end of this prompt.
 
 Structural Rules (Crucial for Layout):
 
@@ -306,79 +440,27 @@ Leaf Nodes: type: "frontend" or type: "utility"
 
 JSON Schema: Return ONLY valid JSON. Do not write markdown intro/outro text.
 ```json
-{
-  "metadata": {
-    "projectName": "Project Title",
-    "description": "Short description of the visualization.",
-    "version": "1.0",
-    "author": "AI",
-    "topic": "slug-format",
-    "contentType": "educational"
-  },
-  "nodes": [
-    {
-      "id": "root-id",
-      "data": {
-        "label": "Main Topic Name",
-        "type": "data",
-        "description": "Short description.",
-        "summary": "Detailed, informative summary (2-3 sentences) explaining the main topic concept."
-      }
-    },
-    {
-      "id": "category-id",
-      "data": {
-        "label": "Category Name",
-        "type": "backend",
-        "description": "Short description of this category.",
-        "summary": "Detailed summary explaining what this category encompasses."
-      }
-    },
-    {
-      "id": "item-id",
-      "data": {
-        "label": "Specific Item Name",
-        "type": "frontend",
-        "description": "Short description.",
-        "summary": "Detailed summary explaining this specific item.",
-        // You may add specific arrays relevant to the topic here
-        "characteristics": ["Trait 1", "Trait 2"],
-        "examples": ["Ex 1", "Ex 2"]
-      }
-    }
-  ],
-  "hierarchy": {
-    "root-id": ["category-1-id", "category-2-id"],
-    "category-1-id": ["item-a-id", "item-b-id"]
-  },
-  "edges": [
-    {
-      "id": "e1",
-      "source": "root-id",
-      "target": "category-1-id",
-      "type": "establishes"
-    },
-    {
-      "id": "e2",
-      "source": "category-1-id",
-      "target": "item-a-id",
-      "type": "involves"
-    }
-  ],
-  "details": {}
-}
+"""
+    + _json_example(_KNOWLEDGE_GRAPH_EXAMPLE)
+    + """
 ```
 
+Item nodes may also carry arrays specific to the topic (e.g., `characteristics`, `examples`).
+
 Requirements:
 1.  **Strict JSON**: Output ONLY valid JSON code. No markdown text before or after (unless inside a code block).
 2.  **Rich Data**: Ensure the "summary" fields are detailed and informative.
 3.  **Structure**: Create a logical hierarchy (Main Topic -> Categories -> Items). At least 15-20 nodes.
+
+Topic: "{INSERT_TOPIC_HERE}"
 """
+)
 
-TIMELINE_PROMPT = """
+TIMELINE_PROMPT = (
+    """
 Role: You are an expert Historian and Data Visualizer. Your goal is to create a clear, chronological Timeline using Mermaid.js syntax.
 
-Task: Generate a JSON object containing the Mermaid Timeline syntax for the topic: "{INSERT_TOPIC_HERE}".
+Task: Generate a JSON object containing the Mermaid Timeline syntax for the topic given at the end of this prompt.
 
 Rules:
 1.  **Chronology:** Ensure events are strictly ordered by date/time.
@@ -396,23 +478,9 @@ Rules:
 The output must strictly adhere to this structure:
 
 ```json
-{
-  "chartType": "timeline",
-  "metadata": {
-    "title": "String (Title of the timeline)",
-    "summary": "String (4-6 sentences explaining the context and significance of the timeline)"
-  },
-  "events": [
-    {
-      "era": "String (The major time period, e.g., 'Pre-War')",
-      "year": "String (Year or Date)",
-      "name": "String (Max 4 words)",
-      "summary": "String (1 sentence for immediate understanding of the event)",
-      "description": "String (3-4 sentences explaining the context and significance of the event)"
-    }
-  ],
-  "mermaid_syntax": "String (The raw Mermaid code)"
-}
+"""
+    + _json_example(_TIMELINE_EXAMPLE)
+    + """
 ```
 
 Steps:
@@ -431,4 +499,149 @@ Events Array:
   { "year": "2002", "name": "Friendster", "summary": "...", "description": "..." }
 ]
 ```
-"""
\ No newline at end of file
+
+Topic: "{INSERT_TOPIC_HERE}"
+"""
+)
+
+
+_TRAILING_SPACE_RE = re.compile(r"[ \t]+\n")
+_BLANK_LINES_RE = re.compile(r"\n{3,}")
+
+
+def _compact(text: str) -> str:
+    """Drop common indentation, trailing spaces and repeated blank lines.
+
+    Only the indentation shared by every line is removed: nested bullets and
+    JSON examples keep their relative indentation, which carries meaning for
+    the model.
+    """
+    text = _TRAILING_SPACE_RE.sub("\n", textwrap.dedent(text))
+    return _BLANK_LINES_RE.sub("\n\n", text).strip() + "\n"
+
+
+def _prepare(text: str) -> str:
+    """Compact a prompt unless PROMPTS_PRETTY asks to keep the source layout."""
+    return text if settings.PROMPTS_PRETTY else _compact(text)
+
+
+# Read-only registry of every prompt keyed by its constant name, so callers
+# can look prompts up by name without being able to mutate or rebind them.
+PROMPTS = MappingProxyType(
+    {
+        "ORCHESTRATOR_SYSTEM_PROMPT": _prepare(ORCHESTRATOR_SYSTEM_PROMPT),
+        "MINDMAP_PROMPT": _prepare(MINDMAP_PROMPT),
+        "SEQUENCE_PROMPT": _prepare(SEQUENCE_PROMPT),
+        "MINDMAP_MOD_PROMPT": _prepare(MINDMAP_MOD_PROMPT),
+        "MODIFICATION_PROMPT": _prepare(MODIFICATION_PROMPT),
+        "MOD_PROMPT_NODE": _prepare(MOD_PROMPT_NODE),
+        "KNOWLEDGE_GRAPH_PROMPT": _prepare(KNOWLEDGE_GRAPH_PROMPT),
+        "TIMELINE_PROMPT": _prepare(TIMELINE_PROMPT),
+    }
+)
+
+ORCHESTRATOR_SYSTEM_PROMPT = PROMPTS["ORCHESTRATOR_SYSTEM_PROMPT"]
+MINDMAP_PROMPT = PROMPTS["MINDMAP_PROMPT"]
+SEQUENCE_PROMPT = PROMPTS["SEQUENCE_PROMPT"]
+MINDMAP_MOD_PROMPT = PROMPTS["MINDMAP_MOD_PROMPT"]
+MODIFICATION_PROMPT = PROMPTS["MODIFICATION_PROMPT"]
+MOD_PROMPT_NODE = PROMPTS["MOD_PROMPT_NODE"]
+KNOWLEDGE_GRAPH_PROMPT = PROMPTS["KNOWLEDGE_GRAPH_PROMPT"]
+TIMELINE_PROMPT = PROMPTS["TIMELINE_PROMPT"]
+
+# UTF-8 encoded prompts for byte-level consumers (hashing, request files).
+# Chat model clients take str and serialize the request body themselves.
+PROMPT_BYTES = MappingProxyType(
+    {name: text.encode("utf-8") for name, text in PROMPTS.items()}
+)
+
+
+# ---------------------------------------------------------------------------
+# Templates
+# ---------------------------------------------------------------------------
+# Each template is split at its placeholders once at import time, so filling a
+# prompt per request is a single join instead of a full scan per `.replace()`.
+# Placeholders sit at the tail of the templates: everything before the first
+# one is identical across calls and can be served from the provider's prompt
+# cache.
+
+TOPIC_PLACEHOLDER = "{INSERT_TOPIC_HERE}"
+JSON_PLACEHOLDER = "{INSERT_CURRENT_JSON_DATA_HERE}"
+REQUEST_PLACEHOLDER = "{REQUEST}"
+
+EPHEMERAL_CACHE_CONTROL = MappingProxyType({"type": "ephemeral"})
+
+
+def _split(template: str, *placeholders: str) -> tuple[str, ...]:
+    """Split a template once at each placeholder, in order of appearance."""
+    parts = []
+    rest = template
+    for placeholder in placeholders:
+        head, rest = rest.split(placeholder, 1)
+        parts.append(head)
+    parts.append(rest)
+    return tuple(parts)
+
+
+def _render(parts: tuple[str, ...], *values: str) -> str:
+    """Interleave pre-split template parts with the given values."""
+    pieces = [parts[0]]
+    for value, part in zip(values, parts[1:]):
+        pieces += (value, part)
+    return "".join(pieces)
+
+
+class PromptTemplate:
+    """A prompt template pre-split at its placeholders."""
+
+    def __init__(self, template: str, *placeholders: str) -> None:
+        self.parts = _split(template, *placeholders)
+
+    @property
+    def static_prefix(self) -> str:
+        """The request-independent text before the first placeholder."""
+        return self.parts[0]
+
+    def render(self, *values: str) -> str:
+        """Fill the placeholders, in order, and return the full prompt."""
+        return _render(self.parts, *values)
+
+    def _render_dynamic(self, values: tuple[str, ...]) -> str:
+        """Render everything after the static prefix."""
+        return _render(("",) + self.parts[1:], *values)
+
+    def render_blocks(
+        self, *values: str, cache_control: bool = False
+    ) -> list[dict[str, Any]]:
+        """Render the prompt as a static text block followed by a dynamic one.
+
+        Args:
+            values: Placeholder values, in order.
+            cache_control: Mark the static block as an ephemeral cache
+                breakpoint. Only pass True for providers that accept the
+                ``cache_control`` field (Anthropic).
+        """
+        static_block: dict[str, Any] = {"type": "text", "text": self.static_prefix}
+        if cache_control:
+            static_block["cache_control"] = dict(EPHEMERAL_CACHE_CONTROL)
+        blocks = [static_block]
+        dynamic = self._render_dynamic(values)
+        if dynamic:
+            blocks.append({"type": "text", "text": dynamic})
+        return blocks
+
+
+ORCHESTRATOR_TEMPLATE = PromptTemplate(ORCHESTRATOR_SYSTEM_PROMPT)
+MINDMAP_TEMPLATE = PromptTemplate(MINDMAP_PROMPT, TOPIC_PLACEHOLDER)
+SEQUENCE_TEMPLATE = PromptTemplate(SEQUENCE_PROMPT, TOPIC_PLACEHOLDER)
+KNOWLEDGE_GRAPH_TEMPLATE = PromptTemplate(KNOWLEDGE_GRAPH_PROMPT, TOPIC_PLACEHOLDER)
+TIMELINE_TEMPLATE = PromptTemplate(TIMELINE_PROMPT, TOPIC_PLACEHOLDER)
+MINDMAP_MOD_TEMPLATE = PromptTemplate(
+    MINDMAP_MOD_PROMPT, JSON_PLACEHOLDER, REQUEST_PLACEHOLDER
+)
+MODIFICATION_TEMPLATE = PromptTemplate(
+    MODIFICATION_PROMPT, JSON_PLACEHOLDER, REQUEST_PLACEHOLDER
+)
+MOD_NODE_TEMPLATE = PromptTemplate(
+    MOD_PROMPT_NODE, JSON_PLACEHOLDER, REQUEST_PLACEHOLDER
+)
@@ -0,0 +1,109 @@
+"""Keyword fast path for routing obvious requests without an LLM call."""
+
+import re
+import uuid
+from collections.abc import Sequence
+from typing import Optional
+
+from langchain_core.messages import AIMessage, AnyMessage, HumanMessage
+
+# Keyword -> tool, mirroring the routing rules in ORCHESTRATOR_SYSTEM_PROMPT.
+# Modification keywords are matched only to detect ambiguity: modify tools need
+# the current visualization JSON, so they are always left to the LLM.
+_KEYWORD_TOOLS = {
+    "timeline": "create_timeline",
+    "history": "create_timeline",
+    "chronology": "create_timeline",
+    "graph": "create_knowledge_graph",
+    "hierarchy": "create_knowledge_graph",
+    "network": "create_knowledge_graph",
+    "categories": "create_knowledge_graph",
+    "steps": "create_sequence_diagram",
+    "process": "create_sequence_diagram",
+    "flow": "create_sequence_diagram",
+    "mindmap": "create_mindmap",
+    "modify": "modify_visualization",
+    "add": "modify_visualization",
+    "remove": "modify_visualization",
+    "update": "modify_visualization",
+    "change": "modify_visualization",
+}
+
+# Words allowed around the keyword. Anything else (e.g. a new subject) could be
+# a topic change, which only the LLM can judge.
+_FILLER_WORDS = frozenset(
+    "a an as can chart convert create diagram for generate i in into instead it "
+    "knowledge make me mind now of please same see show that the this to topic "
+    "turn us view want would you".split()
+)
+
+_WORD_RE = re.compile(r"[a-z]+")
+
+
+def fast_route(message: str) -> Optional[str]:
+    """Return the create tool a message unambiguously asks for, if any.
+
+    Args:
+        message: The user's message.
+
+    Returns:
+        The tool name when the message consists only of one structure keyword
+        and filler words (e.g. "show this as a timeline"), otherwise None.
+    """
+    tools = set()
+    for word in _WORD_RE.findall(message.lower()):
+        tool = _KEYWORD_TOOLS.get(word)
+        if tool is not None:
+            tools.add(tool)
+        elif word not in _FILLER_WORDS:
+            return None
+    if len(tools) != 1:
+        return None
+    tool = tools.pop()
+    return None if tool == "modify_visualization" else tool
+
+
+def _current_topic(messages: Sequence[AnyMessage]) -> Optional[str]:
+    """Return the topic of the most recent create tool call in the thread."""
+    for message in reversed(messages):
+        if isinstance(message, AIMessage):
+            for tool_call in reversed(message.tool_calls):
+                topic = tool_call["args"].get("topic")
+                if topic:
+                    return topic
+    return None
+
+
+def fast_route_message(messages: Sequence[AnyMessage]) -> Optional[AIMessage]:
+    """Build the tool call for the latest user message without asking the LLM.
+
+    Only applies to requests to show the current topic in another structure;
+    first messages, topic changes and modifications go through the LLM.
+
+    Args:
+        messages: The conversation so far.
+
+    Returns:
+        An AIMessage calling the routed tool, or None to fall back to the LLM.
+    """
+    if not messages or not isinstance(messages[-1], HumanMessage):
+        return None
+    content = messages[-1].content
+    if not isinstance(content, str):
+        return None
+    tool = fast_route(content)
+    if tool is None:
+        return None
+    topic = _current_topic(messages)
+    if topic is None:
+        return None
+    return AIMessage(
+        content="",
+        tool_calls=[
+            {
+                "name": tool,
+                "args": {"topic": topic},
+                "id": f"call_{uuid.uuid4().hex}",
+            }
+        ],
+    )
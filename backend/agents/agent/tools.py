@@ -1,57 +1,77 @@
 """
 This module provides tools for the complete workflow
 """
-import json
+import asyncio
+import orjson
 import structlog
 from typing import Any, Callable
 from langchain_core.messages import SystemMessage, HumanMessage
 
 from agents.agent.prompts import (
-    MINDMAP_PROMPT,
-    SEQUENCE_PROMPT,
-    MODIFICATION_PROMPT,
-    MOD_PROMPT_NODE,
-    KNOWLEDGE_GRAPH_PROMPT,
-    TIMELINE_PROMPT,
+    MINDMAP_TEMPLATE,
+    SEQUENCE_TEMPLATE,
+    MODIFICATION_TEMPLATE,
+    MOD_NODE_TEMPLATE,
+    KNOWLEDGE_GRAPH_TEMPLATE,
+    TIMELINE_TEMPLATE,
+    PromptTemplate,
 )
-from agents.agent.utils import load_chat_model
+from agents.agent.utils import load_chat_model, supports_cache_control
 from core.config import settings
 
 logger = structlog.getLogger(__name__)
 
+# Mark the static part of each prompt as a cache breakpoint where supported
+CACHE_PROMPT_PREFIX = supports_cache_control(settings.GEMINI_MODEL)
+
+# Shared by every tool call; message objects are not mutated when sent
+TOOL_SYSTEM_MESSAGE = SystemMessage(content="Follow the user message")
+
+# ToolNode runs parallel tool calls concurrently; cap in-flight model requests
+# to stay under the provider's rate limits.
+MODEL_CALL_LIMIT = asyncio.Semaphore(settings.MAX_CONCURRENT_MODEL_CALLS)
+
+
+def _strip_fence(content: str) -> str:
+    """Strip a markdown code fence the model may wrap around its JSON."""
+    return (
+        content.strip()
+        .removeprefix("```json")
+        .removeprefix("```")
+        .removesuffix("```")
+        .strip()
+    )
+
+
+async def _generate(template: PromptTemplate, *values: str) -> str:
+    """Fill a tool prompt, call the model and return its reply without fences.
+
+    Args:
+        template: The tool's prompt template.
+        values: Placeholder values, in order.
+    """
+    prompt = template.render_blocks(*values, cache_control=CACHE_PROMPT_PREFIX)
+    agent = load_chat_model(settings.GEMINI_MODEL)
+    async with MODEL_CALL_LIMIT:
+        response = await agent.ainvoke(
+            [TOOL_SYSTEM_MESSAGE, HumanMessage(content=prompt)]
+        )
+    # Gemini may return a list of content parts; .text joins the text parts
+    return _strip_fence(response.text)
+
 
 async def create_mindmap(topic: str) -> Any:
     """Create a mindmap from a topic."""
 
-    mindmap_prompt = MINDMAP_PROMPT.replace("{INSERT_TOPIC_HERE}", topic)
-    agent = load_chat_model(settings.GEMINI_MODEL)
-    logger.info(f"Creating mindmap for {topic}")
-    response = await agent.ainvoke(
-        [
-            SystemMessage(content="Follow the user message"),
-            HumanMessage(content=mindmap_prompt),
-        ]
-    )
-    # Strip markdown code blocks if the model accidentally includes them
-    clean_content = response.content.replace("```json", "").replace("```", "").strip()
-    return clean_content
+    logger.info("Creating mindmap", topic=topic)
+    return await _generate(MINDMAP_TEMPLATE, topic)
 
 
 async def create_timeline(topic: str) -> Any:
     """Create a timeline for a topic."""
 
-    timeline_prompt = TIMELINE_PROMPT.replace("{INSERT_TOPIC_HERE}", topic)
-    agent = load_chat_model(settings.GEMINI_MODEL)
-    logger.info(f"Creating timeline for {topic}")
-    response = await agent.ainvoke(
-        [
-            SystemMessage(content="Follow the user message"),
-            HumanMessage(content=timeline_prompt),
-        ]
-    )
-    # Strip markdown code blocks if the model accidentally includes them
-    clean_content = response.content.replace("```json", "").replace("```", "").strip()
-    return clean_content
+    logger.info("Creating timeline", topic=topic)
+    return await _generate(TIMELINE_TEMPLATE, topic)
 
 
 async def create_sequence_diagram(topic: str) -> Any:
@@ -60,19 +80,8 @@ async def create_sequence_diagram(topic: str) -> Any:
     Use this for processes, API flows, login sequences, or transaction logic.
     """
 
-    sequence_prompt = SEQUENCE_PROMPT.replace("{INSERT_TOPIC_HERE}", topic)
-
-    agent = load_chat_model(settings.GEMINI_MODEL)
-    logger.info(f"Creating sequence diagram for {topic}")
-    response = await agent.ainvoke(
-        [
-            SystemMessage(content="Follow the user message"),
-            HumanMessage(content=sequence_prompt),
-        ]
-    )
-    # Strip markdown code blocks if the model accidentally includes them
-    clean_content = response.content.replace("```json", "").replace("```", "").strip()
-    return clean_content
+    logger.info("Creating sequence diagram", topic=topic)
+    return await _generate(SEQUENCE_TEMPLATE, topic)
 
 
 async def create_knowledge_graph(topic: str) -> Any:
@@ -81,20 +90,8 @@ async def create_knowledge_graph(topic: str) -> Any:
     Use this for structured datasets, classification, or organized technical stacks.
     """
 
-    knowledge_graph_prompt = KNOWLEDGE_GRAPH_PROMPT.replace(
-        "{INSERT_TOPIC_HERE}", topic
-    )
-    agent = load_chat_model(settings.GEMINI_MODEL)
-    logger.info(f"Creating knowledge graph for {topic}")
-    response = await agent.ainvoke(
-        [
-            SystemMessage(content="Follow the user message"),
-            HumanMessage(content=knowledge_graph_prompt),
-        ]
-    )
-    # Strip markdown code blocks if the model accidentally includes them
-    clean_content = response.content.replace("```json", "").replace("```", "").strip()
-    return clean_content
+    logger.info("Creating knowledge graph", topic=topic)
+    return await _generate(KNOWLEDGE_GRAPH_TEMPLATE, topic)
 
 
 async def modify_visualization(current_json: str, request: str) -> Any:
@@ -105,22 +102,9 @@ async def modify_visualization(current_json: str, request: str) -> Any:
         current_json: The stringified JSON of the current state.
         request: The user's change request.
     """
-    mod_prompt = MODIFICATION_PROMPT.replace(
-        "{INSERT_CURRENT_JSON_DATA_HERE}", str(current_json)
-    )
-    mod_prompt = mod_prompt.replace("{REQUEST}", request)
+    logger.info("Modifying visualization", request=request)
+    return await _generate(MODIFICATION_TEMPLATE, current_json, request)
 
-    agent = load_chat_model(settings.GEMINI_MODEL)
-    logger.info(f"Modifying visualization")
-    response = await agent.ainvoke(
-        [
-            SystemMessage(content="Follow the user message"),
-            HumanMessage(content=mod_prompt),
-        ]
-    )
-    # Strip markdown code blocks if the model accidentally includes them
-    clean_content = response.content.replace("```json", "").replace("```", "").strip()
-    return clean_content
 
 async def modify_node(node_content: str, request: str) -> Any:
     """
@@ -130,23 +114,22 @@ async def modify_node(node_content: str, request: str) -> Any:
         node_content: The stringified JSON of the current state.
         request: The user's change request.
     """
-    mod_prompt = MOD_PROMPT_NODE.replace(
-        "{INSERT_CURRENT_JSON_DATA_HERE}", str(node_content)
-    )
-    mod_prompt_node = mod_prompt.replace("{REQUEST}", request)
+    logger.info("Modifying node content", request=request)
+    clean_content = await _generate(MOD_NODE_TEMPLATE, node_content, request)
+    return orjson.loads(clean_content)["content"]
 
-    agent = load_chat_model(settings.GEMINI_MODEL)
-    logger.info(f"Modifying node content")
-    response = await agent.ainvoke(
-        [
-            SystemMessage(content="Follow the user message"),
-            HumanMessage(content=mod_prompt_node),
-        ]
+
+async def modify_nodes(edits: list[tuple[str, str]]) -> list[Any]:
+    """
+    Modifies several node contents concurrently.
+    Args:
+        edits: (node_content, request) pairs.
+    Returns:
+        The modified contents, in the order of ``edits``.
+    """
+    return await asyncio.gather(
+        *(modify_node(node_content, request) for node_content, request in edits)
     )
-    # Strip markdown code blocks if the model accidentally includes them
-    clean_content = response.content.replace("```json", "").replace("```", "").strip()
-    clean_content = json.loads(clean_content)["content"]
-    return clean_content
 
 
 TOOLS: list[Callable[..., Any]] = [
@@ -2,6 +2,7 @@
 
 import os
 import structlog
+from functools import lru_cache
 from typing import Any
 
 
@@ -15,6 +16,9 @@ from dotenv import load_dotenv
 load_dotenv()
 logger = structlog.getLogger(__name__)
 
+# Read once after load_dotenv(); validated when an OpenRouter model is built
+OPENROUTER_API_KEY = os.getenv("OPENROUTER_API_KEY")
+
 
 def openrouter_chat_model(model: str, **kwargs: Any) -> BaseChatModel:
     """
@@ -28,25 +32,44 @@ def openrouter_chat_model(model: str, **kwargs: Any) -> BaseChatModel:
         BaseChatModel: A ready-to-use LangChain Chat model.
     """
 
-    api_key = os.getenv("OPENROUTER_API_KEY")
-    if not api_key:
+    if not OPENROUTER_API_KEY:
         raise EnvironmentError("Missing OPENROUTER_API_KEY environment variable.")
 
     # Use OpenRouter's OpenAI-compatible endpoint
     base_url = "https://openrouter.ai/api/v1"
 
     chat_model = ChatOpenAI(
-        model=model, openai_api_key=api_key, openai_api_base=base_url, **kwargs
+        model=model,
+        openai_api_key=OPENROUTER_API_KEY,
+        openai_api_base=base_url,
+        **kwargs,
     )
 
     return chat_model
 
 
+@lru_cache(maxsize=32)
 def load_chat_model(fully_specified_name: str) -> BaseChatModel:
     """Load a chat model from a fully specified name.
 
+    The model and its HTTP client are built once per name and shared; chat
+    models are safe to use from concurrent ``ainvoke`` calls.
+
     Args:
         fully_specified_name (str): String in the format 'provider/model'.
     """
     provider, model = fully_specified_name.split("/", maxsplit=1)
     return init_chat_model(model, model_provider=provider)
+
+
+def supports_cache_control(fully_specified_name: str) -> bool:
+    """Whether the provider accepts ``cache_control`` markers on content blocks.
+
+    Anthropic needs explicit cache breakpoints; Google and OpenAI cache
+    repeated prompt prefixes automatically and reject or ignore the field.
+
+    Args:
+        fully_specified_name (str): String in the format 'provider/model'.
+    """
+    provider = fully_specified_name.split("/", maxsplit=1)[0]
+    return provider == "anthropic"
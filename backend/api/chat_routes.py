@@ -1,15 +1,16 @@
 """Chat endpoints for Agent Protocol"""
 
 import asyncio
-from datetime import datetime, timezone, UTC
 from typing import List, Dict, Any
-from uuid import uuid4
 
-from fastapi import APIRouter, HTTPException, Depends, Query
-from fastapi.responses import StreamingResponse
-from sqlalchemy import select, update, or_
+from fastapi import APIRouter, HTTPException, Depends, Query, Request
+from fastapi.responses import Response, StreamingResponse
+from sqlalchemy import bindparam, func, insert, select, update
+from sqlalchemy.dialects.postgresql import JSONB
 from sqlalchemy.ext.asyncio import AsyncSession
+import orjson
 import structlog
+from uuid_utils import uuid7
 
 from core.orm import (
     Assistant as AssistantORM,
@@ -30,6 +31,8 @@ from models.threads import (
     UpdateThreadRequest,
     ModifyNodeRequest,
     ModifyNodeResponse,
+    ModifyNodesRequest,
+    ModifyNodesResponse,
 )
 
 from models.runs import (
@@ -39,21 +42,54 @@ from models.runs import (
 )
 
 from misc.utils import (
-    set_thread_status,
-    update_thread_metadata,
+    mark_thread_busy,
     execute_run_async,
     resolve_assistant_id,
+    get_assistant,
     _merge_jsonb,
 )
 from services.langgraph_service import get_langgraph_service, create_thread_config
 from services.streaming_service import streaming_service
 from utils.user_utils import get_current_user
-from agents.agent.tools import modify_node
+from agents.agent.tools import modify_node, modify_nodes
 
 router = APIRouter()
 
 logger = structlog.getLogger(__name__)
 
+# Run lookups polled by clients, built once; values are bound per request
+GET_RUN_STMT = select(RunORM).where(
+    RunORM.run_id == bindparam("run_id"),
+    RunORM.thread_id == bindparam("thread_id"),
+    RunORM.user_id == bindparam("user_id"),
+)
+# Selects the table's columns, which match the Run response fields, so rows can
+# be serialized as-is without building ORM or Pydantic objects
+LIST_RUNS_STMT = (
+    select(RunORM.__table__)
+    .where(
+        RunORM.thread_id == bindparam("thread_id"),
+        RunORM.user_id == bindparam("user_id"),
+    )
+    .order_by(RunORM.created_at.desc())
+)
+# Columns of the Thread response model
+THREAD_COLUMNS = (
+    ThreadORM.thread_id,
+    ThreadORM.assistant_id,
+    ThreadORM.status,
+    ThreadORM.metadata_json.label("metadata"),
+    ThreadORM.user_id,
+    ThreadORM.created_at,
+)
+
+
+def _json_response(content: Any) -> Response:
+    """Serialize known-valid row data with orjson, skipping response_model validation."""
+    return Response(
+        orjson.dumps(content, option=orjson.OPT_UTC_Z), media_type="application/json"
+    )
+
 
 @router.post("/chat/new", response_model=Thread)
 async def create_chat(
@@ -62,7 +98,7 @@ async def create_chat(
     session: AsyncSession = Depends(get_session),
 ):
     """Create a new chat thread."""
-    thread_id = str(uuid4())
+    thread_id = str(uuid7())
     stmt = select(AssistantORM).where(
         AssistantORM.graph_id == request.graph_id,
     )
@@ -79,39 +115,51 @@ async def create_chat(
         }
     )
 
-    thread_orm = ThreadORM(
-        assistant_id=str(assistant.assistant_id),
-        thread_id=thread_id,
-        status="idle",
-        metadata_json=metadata,
-        user_id=user.user_id,
+    # Insert and read back the server defaults (created_at) in one statement
+    thread_orm = await session.scalar(
+        insert(ThreadORM)
+        .values(
+            assistant_id=str(assistant.assistant_id),
+            thread_id=thread_id,
+            status="idle",
+            metadata_json=metadata,
+            user_id=user.user_id,
+        )
+        .returning(ThreadORM)
     )
-
-    # SQLAlchemy AsyncSession.add is sync; do not await
-    session.add(thread_orm)
     await session.commit()
 
-    try:
-        await session.refresh(thread_orm)
-    except Exception:
-        pass
+    return Thread.model_validate(thread_orm)
 
-    thread_dict: Dict[str, Any] = {
-        "user_id": thread_orm.user_id,
-        "thread_id": thread_orm.thread_id,
-        "assistant_id": thread_orm.assistant_id,
-        "status": thread_orm.status,
-        "metadata": thread_orm.metadata_json,
-        "created_at": thread_orm.created_at,
-    }
 
-    return Thread.model_validate(thread_dict)
+def _snapshot_to_thread_state(snapshot: Any) -> ThreadState:
+    """Map a LangGraph state snapshot to the ThreadState response model."""
+    snap_config = getattr(snapshot, "config", {}) or {}
+    parent_config = getattr(snapshot, "parent_config", {}) or {}
+    checkpoint_id = None
+    parent_checkpoint_id = None
+    if isinstance(snap_config, dict):
+        checkpoint_id = (snap_config.get("configurable") or {}).get("checkpoint_id")
+    if isinstance(parent_config, dict):
+        parent_checkpoint_id = (parent_config.get("configurable") or {}).get(
+            "checkpoint_id"
+        )
+
+    return ThreadState(
+        values=getattr(snapshot, "values", {}),
+        next=getattr(snapshot, "next", []) or [],
+        metadata=getattr(snapshot, "metadata", {}) or {},
+        created_at=getattr(snapshot, "created_at", None),
+        checkpoint_id=checkpoint_id,
+        parent_checkpoint_id=parent_checkpoint_id,
+    )
 
 
 @router.post("/chat/{thread_id}/history", response_model=List[ThreadState])
 async def get_chat_history(
     thread_id: str,
     request: ThreadHistoryRequest,
+    http_request: Request,
     user: User = Depends(get_current_user),
     session: AsyncSession = Depends(get_session),
 ):
@@ -145,7 +193,11 @@ async def get_chat_history(
             raise HTTPException(422, "Invalid 'checkpoint_ns'; must be a string")
 
         logger.debug(
-            f"history POST: thread_id={thread_id} limit={limit} before={before} checkpoint_ns={checkpoint_ns}"
+            "history POST",
+            thread_id=thread_id,
+            limit=limit,
+            before=before,
+            checkpoint_ns=checkpoint_ns,
         )
 
         # Verify the thread exists and belongs to the user
@@ -161,7 +213,7 @@ async def get_chat_history(
         graph_id = thread_metadata.get("graph_id")
         if not graph_id:
             # Return empty history if no graph is associated yet
-            logger.info(f"history POST: no graph_id set for thread {thread_id}")
+            logger.info("history POST: no graph_id set", thread_id=thread_id)
             return []
 
         # Get compiled graph
@@ -184,7 +236,6 @@ async def get_chat_history(
             config["configurable"]["checkpoint_ns"] = checkpoint_ns
 
         # Fetch state history
-        state_snapshots = []
         kwargs = {
             "limit": limit,
             "before": before,
@@ -193,38 +244,20 @@ async def get_chat_history(
         if metadata is not None:
             kwargs["metadata"] = metadata  # type: ignore[index]
 
-        async for snapshot in agent.aget_state_history(config, **kwargs):
-            state_snapshots.append(snapshot)
-
-        # Map to ThreadState
-        thread_states: List[ThreadState] = []
-        for snapshot in state_snapshots:
-            snap_config = getattr(snapshot, "config", {}) or {}
-            parent_config = getattr(snapshot, "parent_config", {}) or {}
-            checkpoint_id = None
-            parent_checkpoint_id = None
-            if isinstance(snap_config, dict):
-                checkpoint_id = (snap_config.get("configurable") or {}).get(
-                    "checkpoint_id"
-                )
-            if isinstance(parent_config, dict):
-                parent_checkpoint_id = (parent_config.get("configurable") or {}).get(
-                    "checkpoint_id"
-                )
-
-            created_at = getattr(snapshot, "created_at", None)
-
-            thread_state = ThreadState(
-                values=getattr(snapshot, "values", {}),
-                next=getattr(snapshot, "next", []) or [],
-                metadata=getattr(snapshot, "metadata", {}) or {},
-                created_at=created_at,
-                checkpoint_id=checkpoint_id,
-                parent_checkpoint_id=parent_checkpoint_id,
+        snapshots = agent.aget_state_history(config, **kwargs)
+
+        # Clients that accept NDJSON get each state as soon as it is read
+        if "application/x-ndjson" in http_request.headers.get("accept", ""):
+
+            async def stream_states():
+                async for snapshot in snapshots:
+                    yield _snapshot_to_thread_state(snapshot).model_dump_json() + "\n"
+
+            return StreamingResponse(
+                stream_states(), media_type="application/x-ndjson"
             )
-            thread_states.append(thread_state)
 
-        return thread_states
+        return [_snapshot_to_thread_state(snapshot) async for snapshot in snapshots]
 
     except HTTPException:
         raise
@@ -245,7 +278,7 @@ async def chat_search(
 ):
     """Search chats with filters"""
 
-    stmt = select(ThreadORM).where(ThreadORM.user_id == user.user_id)
+    stmt = select(*THREAD_COLUMNS).where(ThreadORM.user_id == user.user_id)
 
     if request.status:
         stmt = stmt.where(
@@ -253,37 +286,23 @@ async def chat_search(
         )
 
     if request.metadata:
-        # For each key/value, filter JSONB field
-        for key, value in request.metadata.items():
-            stmt = stmt.where(ThreadORM.metadata_json[key].as_string() == str(value))
+        # Single JSONB containment check (@>), served by idx_thread_metadata
+        stmt = stmt.where(ThreadORM.metadata_json.contains(request.metadata))
 
-    # Count total first
-    _count_result = await session.scalars(stmt)
-    total = len(_count_result.all())
+    # Count matches in the database instead of loading every row
+    total = await session.scalar(select(func.count()).select_from(stmt.subquery()))
 
     offset = request.offset or 0
     limit = request.limit or 20
     # Return latest first
     stmt = stmt.order_by(ThreadORM.created_at.desc()).offset(offset).limit(limit)
 
-    result = await session.scalars(stmt)
-    rows = result.all()
-    threads_models = [
-        Thread.model_validate(
-            {
-                **{c.name: getattr(t, c.name) for c in t.__table__.columns},
-                "metadata": t.metadata_json,
-            }
-        )
-        for t in rows
-    ]
+    result = await session.execute(stmt)
+    threads = [dict(row) for row in result.mappings()]
 
     # Return array of threads for client/vendor parity
-    return ThreadSearchResponse(
-        threads=threads_models,
-        total=total,
-        limit=limit,
-        offset=offset,
+    return _json_response(
+        {"threads": threads, "total": total, "limit": limit, "offset": offset}
     )
 
 
@@ -296,46 +315,41 @@ async def update_chat(
 ):
     """Update chat"""
 
-    thread_orm = await session.scalar(
-        select(ThreadORM).where(
-            ThreadORM.thread_id == str(thread_id),
-            ThreadORM.user_id == user.user_id,
-        )
-    )
-
-    if not thread_orm:
-        raise HTTPException(404, f"Chat '{thread_orm}' not found")
-
-    assistant_id = thread_orm.assistant_id
-    metadata = thread_orm.metadata_json
+    values: Dict[str, Any] = {}
+    metadata_patch: Dict[str, Any] = {}
     if request.graph_id:
-        metadata["graph_id"] = request.graph_id
+        metadata_patch["graph_id"] = request.graph_id
         assistant_orm = select(AssistantORM).where(
             AssistantORM.graph_id == request.graph_id
         )
         assistant = await session.scalar(assistant_orm)
-        assistant_id = assistant.assistant_id
-        metadata["assistant_id"] = str(assistant_id)
+        values["assistant_id"] = assistant.assistant_id
+        metadata_patch["assistant_id"] = str(assistant.assistant_id)
     if request.thread_name:
-        metadata["thread_name"] = request.thread_name
+        metadata_patch["thread_name"] = request.thread_name
 
-    thread_orm.metadata_json = metadata
-    update_stmt = (
+    # Merge the metadata keys server-side (jsonb ||) and read the row back in
+    # the same statement
+    thread_orm = await session.scalar(
         update(ThreadORM)
-        .where(ThreadORM.thread_id == thread_id)
-        .values(assistant_id=assistant_id, metadata_json=metadata)
+        .where(
+            ThreadORM.thread_id == str(thread_id),
+            ThreadORM.user_id == user.user_id,
+        )
+        .values(
+            metadata_json=ThreadORM.metadata_json.op("||")(
+                bindparam("metadata_patch", metadata_patch, type_=JSONB)
+            ),
+            **values,
+        )
+        .returning(ThreadORM)
     )
-    await session.execute(update_stmt)
+
+    if not thread_orm:
+        raise HTTPException(404, f"Chat '{thread_id}' not found")
 
     await session.commit()
-    return Thread(
-        thread_id=thread_id,
-        assistant_id=str(assistant_id),
-        metadata=thread_orm.metadata_json,
-        user_id=thread_orm.user_id,
-        created_at=thread_orm.created_at,
-        status=thread_orm.status,
-    )
+    return Thread.model_validate(thread_orm)
 
 
 @router.delete("/threads/{thread_id}")
@@ -369,12 +383,11 @@ async def delete_chat(
     # Cancel active runs if they exist
     if active_runs_list:
         logger.info(
-            f"Cancelling {len(active_runs_list)} active runs for thread {thread_id}"
+            "Cancelling active runs", count=len(active_runs_list), thread_id=thread_id
         )
 
-        for run in active_runs_list:
-            run_id = run.run_id
-            logger.debug(f"Cancelling run {run_id}")
+        async def cancel_run(run_id: str) -> None:
+            logger.debug("Cancelling run", run_id=run_id)
 
             # Cancel via streaming service
             await streaming_service.cancel_run(run_id)
@@ -389,14 +402,19 @@ async def delete_chat(
                 except asyncio.CancelledError:
                     pass
                 except Exception as e:
-                    logger.warning(f"Error waiting for task {run_id} to settle: {e}")
+                    logger.warning(
+                        "Error waiting for task to settle", run_id=run_id, error=str(e)
+                    )
+
+        # Runs are independent; let them settle concurrently
+        await asyncio.gather(*(cancel_run(run.run_id) for run in active_runs_list))
 
     # Delete thread (CASCADE DELETE will automatically remove all runs)
     await session.delete(thread)
     await session.commit()
 
     logger.info(
-        f"Deleted thread {thread_id} (cancelled {len(active_runs_list)} active runs)"
+        "Deleted thread", thread_id=thread_id, cancelled_runs=len(active_runs_list)
     )
     return {"status": "deleted"}
 
@@ -410,20 +428,19 @@ async def create_run(
 ):
     """Create and execute a new run (persisted)."""
 
-    run_id = str(uuid4())
+    run_id = str(uuid7())
 
     # Get LangGraph service
     langgraph_service = get_langgraph_service()
     logger.info(
-        f"create_run: scheduling background task run_id={run_id} thread_id={thread_id} user={user.user_id}"
-    )
-    logger.info(
-        f"[create_run] scheduling background task run_id={run_id} thread_id={thread_id} user={user.user_id}"
+        "[create_run] scheduling background task",
+        run_id=run_id,
+        thread_id=thread_id,
+        user=user.user_id,
     )
 
-    # Mark thread as busy and update metadata with assistant/graph info
-    await set_thread_status(session, thread_id, "busy")
-    metadata = await update_thread_metadata(session, thread_id)
+    # Mark thread as busy; committed together with the run record below
+    metadata = await mark_thread_busy(session, thread_id)
 
     # Validate assistant exists and get its graph_id. If a graph_id was provided
     # instead of an assistant UUID, map it deterministically and fall back to the
@@ -449,12 +466,7 @@ async def create_run(
     else:
         context = configurable.copy()
 
-    assistant_stmt = select(AssistantORM).where(
-        AssistantORM.assistant_id == resolved_assistant_id,
-        or_(AssistantORM.user_id == user.user_id, AssistantORM.user_id == "system"),
-    )
-
-    assistant = await session.scalar(assistant_stmt)
+    assistant = await get_assistant(session, resolved_assistant_id, user.user_id)
 
     if not assistant:
         raise HTTPException(404, f"Assistant '{resolved_assistant_id}' not found")
@@ -463,15 +475,12 @@ async def create_run(
     context = _merge_jsonb(assistant.context, context)
 
     # Validate the assistant's graph exists
-    available_graphs = langgraph_service.list_graphs()
-
     if assistant.graph_id not in available_graphs:
         raise HTTPException(
             404, f"Graph '{assistant.graph_id}' not found for assistant"
         )
 
     # Persist run record via ORM model in core.orm (Run table)
-    now = datetime.now(UTC)
     run_orm = RunORM(
         run_id=run_id,  # explicitly set (DB can also default-generate if omitted)
         thread_id=thread_id,
@@ -481,8 +490,6 @@ async def create_run(
         config=config,
         context=context,
         user_id=user.user_id,
-        created_at=now,
-        updated_at=now,
         output=None,
         error_message=None,
     )
@@ -490,20 +497,7 @@ async def create_run(
     await session.commit()
 
     # Build response from ORM -> Pydantic
-    run = Run(
-        run_id=run_id,
-        thread_id=thread_id,
-        assistant_id=resolved_assistant_id,
-        status="pending",
-        input=request.input or {},
-        config=config,
-        context=context,
-        user_id=user.user_id,
-        created_at=now,
-        updated_at=now,
-        output=None,
-        error_message=None,
-    )
+    run = Run.model_validate(run_orm)
 
     # Start execution asynchronously
     # Don't pass the session to avoid transaction conflicts
@@ -521,7 +515,7 @@ async def create_run(
         )
     )
     logger.info(
-        f"[create_run] background task created task_id={id(task)} for run_id={run_id}"
+        "[create_run] background task created", task_id=id(task), run_id=run_id
     )
     active_runs[run_id] = task
 
@@ -537,17 +531,19 @@ async def create_and_stream_run(
 ) -> StreamingResponse:
     """Create a new run and stream its execution - persisted + SSE."""
 
-    run_id = str(uuid4())
+    run_id = str(uuid7())
 
     # Get LangGraph service
     langgraph_service = get_langgraph_service()
     logger.info(
-        f"[create_and_stream_run] scheduling background task run_id={run_id} thread_id={thread_id} user={user.user_id}"
+        "[create_and_stream_run] scheduling background task",
+        run_id=run_id,
+        thread_id=thread_id,
+        user=user.user_id,
     )
 
-    # Mark thread as busy and update metadata with assistant/graph info
-    await set_thread_status(session, thread_id, "busy")
-    metadata = await update_thread_metadata(session, thread_id)
+    # Mark thread as busy; committed together with the run record below
+    metadata = await mark_thread_busy(session, thread_id)
 
     # Validate assistant exists and get its graph_id. If a graph_id was provided
     # instead of an assistant UUID, map it deterministically and fall back to the
@@ -573,11 +569,7 @@ async def create_and_stream_run(
     else:
         context = configurable.copy()
 
-    assistant_stmt = select(AssistantORM).where(
-        AssistantORM.assistant_id == resolved_assistant_id,
-        or_(AssistantORM.user_id == user.user_id, AssistantORM.user_id == "system"),
-    )
-    assistant = await session.scalar(assistant_stmt)
+    assistant = await get_assistant(session, resolved_assistant_id, user.user_id)
     if not assistant:
         raise HTTPException(404, f"Assistant '{resolved_assistant_id}' not found")
 
@@ -585,13 +577,11 @@ async def create_and_stream_run(
     context = _merge_jsonb(assistant.context, context)
 
     # Validate the assistant's graph exists
-    available_graphs = langgraph_service.list_graphs()
     if assistant.graph_id not in available_graphs:
         raise HTTPException(
             404, f"Graph '{assistant.graph_id}' not found for assistant"
         )
     # Persist run record
-    now = datetime.now(UTC)
     run_orm = RunORM(
         run_id=run_id,
         thread_id=thread_id,
@@ -601,8 +591,6 @@ async def create_and_stream_run(
         config=config,
         context=context,
         user_id=user.user_id,
-        created_at=now,
-        updated_at=now,
         output=None,
         error_message=None,
     )
@@ -610,20 +598,7 @@ async def create_and_stream_run(
     await session.commit()
 
     # Build response model for stream context
-    run = Run(
-        run_id=run_id,
-        thread_id=thread_id,
-        assistant_id=resolved_assistant_id,
-        status="streaming",
-        input=request.input or {},
-        config=config,
-        context=context,
-        user_id=user.user_id,
-        created_at=now,
-        updated_at=now,
-        output=None,
-        error_message=None,
-    )
+    run = Run.model_validate(run_orm)
 
     # Start background execution that will populate the broker
     # Don't pass the session to avoid transaction conflicts
@@ -641,7 +616,9 @@ async def create_and_stream_run(
         )
     )
     logger.info(
-        f"[create_and_stream_run] background task created task_id={id(task)} for run_id={run_id}"
+        "[create_and_stream_run] background task created",
+        task_id=id(task),
+        run_id=run_id,
     )
     active_runs[run_id] = task
 
@@ -676,25 +653,25 @@ async def get_run(
     session: AsyncSession = Depends(get_session),
 ):
     """Get run by ID (persisted)."""
-    stmt = select(RunORM).where(
-        RunORM.run_id == str(run_id),
-        RunORM.thread_id == thread_id,
-        RunORM.user_id == user.user_id,
-    )
     logger.info(
-        f"[get_run] querying DB run_id={run_id} thread_id={thread_id} user={user.user_id}"
+        "[get_run] querying DB", run_id=run_id, thread_id=thread_id, user=user.user_id
+    )
+    run_orm = await session.scalar(
+        GET_RUN_STMT,
+        {"run_id": str(run_id), "thread_id": thread_id, "user_id": user.user_id},
     )
-    run_orm = await session.scalar(stmt)
     if not run_orm:
         raise HTTPException(404, f"Run '{run_id}' not found")
 
     logger.info(
-        f"[get_run] found run status={run_orm.status} user={user.user_id} thread_id={thread_id} run_id={run_id}"
+        "[get_run] found run",
+        status=run_orm.status,
+        user=user.user_id,
+        thread_id=thread_id,
+        run_id=run_id,
     )
     # Convert to Pydantic
-    return Run.model_validate(
-        {c.name: getattr(run_orm, c.name) for c in run_orm.__table__.columns}
-    )
+    return Run.model_validate(run_orm)
 
 
 @router.get("/chat/{thread_id}/runs", response_model=list[Run])
@@ -704,25 +681,29 @@ async def list_runs(
     session: AsyncSession = Depends(get_session),
 ):
     """List runs for a specific thread (persisted)."""
-    stmt = (
-        select(RunORM)
-        .where(
-            RunORM.thread_id == thread_id,
-            RunORM.user_id == user.user_id,
+    logger.info("[list_runs] querying DB", thread_id=thread_id, user=user.user_id)
+    # Server-side cursor: rows are fetched and sent in batches, so long run
+    # histories are never held in memory at once
+    result = await session.stream(
+        LIST_RUNS_STMT.execution_options(yield_per=100),
+        {"thread_id": thread_id, "user_id": user.user_id},
+    )
+
+    async def stream_runs():
+        total = 0
+        yield b"["
+        async for partition in result.mappings().partitions():
+            batch = b",".join(
+                orjson.dumps(dict(row), option=orjson.OPT_UTC_Z) for row in partition
+            )
+            yield batch if total == 0 else b"," + batch
+            total += len(partition)
+        yield b"]"
+        logger.info(
+            "[list_runs] done", total=total, thread_id=thread_id, user=user.user_id
         )
-        .order_by(RunORM.created_at.desc())
-    )
-    logger.info(f"[list_runs] querying DB thread_id={thread_id} user={user.user_id}")
-    result = await session.scalars(stmt)
-    rows = result.all()
-    runs = [
-        Run.model_validate({c.name: getattr(r, c.name) for c in r.__table__.columns})
-        for r in rows
-    ]
-    logger.info(
-        f"[list_runs] total={len(runs)} thread_id={thread_id} user={user.user_id}"
-    )
-    return runs
+
+    return StreamingResponse(stream_runs(), media_type="application/json")
 
 
 @router.patch("/chat/{thread_id}/runs/{run_id}")
@@ -734,52 +715,45 @@ async def update_run(
     session: AsyncSession = Depends(get_session),
 ):
     """Update run status (for cancellation/interruption, persisted)."""
-    logger.info(
-        f"[update_run] fetch for update run_id={run_id} thread_id={thread_id} user={user.user_id}"
-    )
-    run_orm = await session.scalar(
-        select(RunORM).where(
-            RunORM.run_id == str(run_id),
-            RunORM.thread_id == thread_id,
-            RunORM.user_id == user.user_id,
-        )
+    run_filter = (
+        RunORM.run_id == str(run_id),
+        RunORM.thread_id == thread_id,
+        RunORM.user_id == user.user_id,
     )
-    if not run_orm:
-        raise HTTPException(404, f"Run '{run_id}' not found")
 
     # Handle interruption/cancellation
-    if request.status == "cancelled":
+    if request.status in ("cancelled", "interrupted"):
         logger.info(
-            f"[update_run] cancelling run_id={run_id} user={user.user_id} thread_id={thread_id}"
+            "[update_run] set DB status",
+            status=request.status,
+            run_id=run_id,
+            user=user.user_id,
+            thread_id=thread_id,
         )
-        await streaming_service.cancel_run(run_id)
-        logger.info(f"[update_run] set DB status=cancelled run_id={run_id}")
-        await session.execute(
+        # Persist the status and read the run back in one statement; the
+        # ownership filter also guards the task cancellation below
+        run_orm = await session.scalar(
             update(RunORM)
-            .where(RunORM.run_id == str(run_id))
-            .values(status="cancelled", updated_at=datetime.now(timezone.utc))
+            .where(*run_filter)
+            .values(status=request.status)
+            .returning(RunORM)
         )
+        if not run_orm:
+            raise HTTPException(404, f"Run '{run_id}' not found")
         await session.commit()
-        logger.info(f"[update_run] commit done (cancelled) run_id={run_id}")
-    elif request.status == "interrupted":
         logger.info(
-            f"[update_run] interrupt run_id={run_id} user={user.user_id} thread_id={thread_id}"
-        )
-        await streaming_service.interrupt_run(run_id)
-        logger.info(f"[update_run] set DB status=interrupted run_id={run_id}")
-        await session.execute(
-            update(RunORM)
-            .where(RunORM.run_id == str(run_id))
-            .values(status="interrupted", updated_at=datetime.now(timezone.utc))
+            "[update_run] commit done", status=request.status, run_id=run_id
         )
-        await session.commit()
-        logger.info(f"[update_run] commit done (interrupted) run_id={run_id}")
+        if request.status == "cancelled":
+            await streaming_service.cancel_run(run_id)
+        else:
+            await streaming_service.interrupt_run(run_id)
+    else:
+        run_orm = await session.scalar(select(RunORM).where(*run_filter))
+        if not run_orm:
+            raise HTTPException(404, f"Run '{run_id}' not found")
 
-    # Return final run state
-    run_orm = await session.scalar(select(RunORM).where(RunORM.run_id == run_id))
-    return Run.model_validate(
-        {c.name: getattr(run_orm, c.name) for c in run_orm.__table__.columns}
-    )
+    return Run.model_validate(run_orm)
 
 
 @router.post("/chat/{thread_id}/runs/{run_id}/cancel")
@@ -805,37 +779,28 @@ async def cancel_run_endpoint(
     - action=interrupt => cooperative interrupt if supported
     - wait=1 => await background task to finish settling
     """
-    logger.info(f"[cancel_run] fetch run run_id={run_id} thread_id={thread_id}")
+    status = "interrupted" if action == "interrupt" else "cancelled"
+    logger.info("[cancel_run]", action=action, run_id=run_id, thread_id=thread_id)
+    # Persist the status and read the run back in one statement; the
+    # ownership filter also guards the task cancellation below
     run_orm = await session.scalar(
-        select(RunORM).where(
+        update(RunORM)
+        .where(
             RunORM.run_id == run_id,
             RunORM.thread_id == thread_id,
             RunORM.user_id == user.user_id,
         )
+        .values(status=status)
+        .returning(RunORM)
     )
     if not run_orm:
         raise HTTPException(404, f"Run '{run_id}' not found")
+    await session.commit()
 
     if action == "interrupt":
-        logger.info(f"[cancel_run] interrupt run_id={run_id} hread_id={thread_id}")
         await streaming_service.interrupt_run(run_id)
-        # Persist status as interrupted
-        await session.execute(
-            update(RunORM)
-            .where(RunORM.run_id == str(run_id))
-            .values(status="interrupted", updated_at=datetime.now(timezone.utc))
-        )
-        await session.commit()
     else:
-        logger.info(f"[cancel_run] cancel run_id={run_id} thread_id={thread_id}")
         await streaming_service.cancel_run(run_id)
-        # Persist status as cancelled
-        await session.execute(
-            update(RunORM)
-            .where(RunORM.run_id == str(run_id))
-            .values(status="cancelled", updated_at=datetime.now(timezone.utc))
-        )
-        await session.commit()
 
     # Optionally wait for background task
     if wait:
@@ -847,19 +812,11 @@ async def cancel_run_endpoint(
                 pass
             except Exception:
                 pass
+            # The task may have written its final state while settling
+            await session.refresh(run_orm)
 
-    # Reload and return updated Run (do NOT delete here; deletion is a separate endpoint)
-    run_orm = await session.scalar(
-        select(RunORM).where(
-            RunORM.run_id == run_id,
-            RunORM.thread_id == thread_id,
-        )
-    )
-    if not run_orm:
-        raise HTTPException(404, f"Run '{run_id}' not found after cancellation")
-    return Run.model_validate(
-        {c.name: getattr(run_orm, c.name) for c in run_orm.__table__.columns}
-    )
+    # Do NOT delete here; deletion is a separate endpoint
+    return Run.model_validate(run_orm)
 
 
 @router.post("/chat/modify-node", response_model=ModifyNodeResponse)
@@ -874,7 +831,7 @@ async def modify_node_content(
     the content of a selected node based on the user's request.
     """
     try:
-        logger.info(f"[modify_node_content] user={user.user_id} request={request.request}...")
+        logger.info("[modify_node_content]", user=user.user_id, request=request.request)
         
         # Call the modify_node tool directly
         modified_content = await modify_node(
@@ -882,15 +839,53 @@ async def modify_node_content(
             request=request.request,
         )
         
-        logger.info(f"[modify_node_content] successfully modified node for user={user.user_id}")
+        logger.info("[modify_node_content] successfully modified node", user=user.user_id)
         
         return ModifyNodeResponse(
             modified_content=modified_content,
             success=True,
         )
     except Exception as e:
-        logger.exception(f"[modify_node_content] error for user={user.user_id}: {e}")
+        logger.exception("[modify_node_content] error", user=user.user_id)
         raise HTTPException(
             status_code=500,
             detail=f"Failed to modify node content: {str(e)}",
         )
+
+
+@router.post("/chat/modify-nodes", response_model=ModifyNodesResponse)
+async def modify_nodes_content(
+    request: ModifyNodesRequest,
+    user: User = Depends(get_current_user),
+):
+    """
+    Modify several nodes' content in one request.
+
+    The edits are sent to the model concurrently instead of one
+    round-trip per node.
+    """
+    try:
+        logger.info(
+            "[modify_nodes_content]", user=user.user_id, edits=len(request.edits)
+        )
+
+        modified_contents = await modify_nodes(
+            [(edit.node_content, edit.request) for edit in request.edits]
+        )
+
+        logger.info(
+            "[modify_nodes_content] successfully modified nodes",
+            count=len(modified_contents),
+            user=user.user_id,
+        )
+
+        return ModifyNodesResponse(
+            modified_contents=modified_contents,
+            success=True,
+        )
+    except Exception as e:
+        logger.exception("[modify_nodes_content] error", user=user.user_id)
+        raise HTTPException(
+            status_code=500,
+            detail=f"Failed to modify node contents: {str(e)}",
+        )
@@ -1,10 +1,14 @@
 """File upload endpoints for RAG functionality."""
 
+import asyncio
+import hashlib
+import os
 from typing import List
 from uuid import uuid4
 
 from fastapi import APIRouter, HTTPException, Depends, UploadFile, File, Form
-from sqlalchemy import select, func, delete
+from sqlalchemy import select, func, delete, insert
+from sqlalchemy.dialects.postgresql import insert as pg_insert
 from sqlalchemy.ext.asyncio import AsyncSession
 import structlog
 
@@ -24,14 +28,113 @@ from models.files import (
     SimilaritySearchResponse,
 )
 from services.file_processor import file_processor
-from services.embedding_service import embedding_service
+from services.embedding_batcher import embedding_batcher
 from services.rag_service import rag_service
+from services.semantic_cache import semantic_cache
 from utils.user_utils import get_current_user
 
 router = APIRouter()
 logger = structlog.getLogger(__name__)
 
 
+def _upload_size(file: UploadFile) -> int:
+    """Return the size of an uploaded file without reading its contents."""
+    if file.size is not None:
+        return file.size
+    # Seek to the end of the spooled file and back
+    size = file.file.seek(0, os.SEEK_END)
+    file.file.seek(0)
+    return size
+
+
+def _content_key(file: UploadFile, content: bytes) -> str:
+    """Hash an upload together with everything that shapes its chunks."""
+    digest = hashlib.sha256(content)
+    digest.update(
+        f"\0{file.content_type}\0{settings.EMBEDDING_MODEL}"
+        f"\0{settings.CHUNK_SIZE}\0{settings.CHUNK_OVERLAP}".encode()
+    )
+    return digest.hexdigest()
+
+
+async def _load_known_chunks(
+    session: AsyncSession, user_id: str, thread_id: str, keys: set[str]
+) -> dict[str, tuple[str, list[tuple[str, int]], list]]:
+    """Load the chunks of the user's earlier uploads with the given content keys.
+
+    Only the user's own files are considered, so neither data nor upload
+    timing depends on what other users have uploaded. A file in
+    ``thread_id`` is preferred as the source, so re-uploading a file under
+    its own name can keep its chunks in place.
+
+    Returns:
+        Content key -> (source file id, (text, token count) chunks,
+        embeddings) for every key that has been uploaded before.
+    """
+    sources = (
+        select(FileUploadORM.id, FileUploadORM.content_hash)
+        .where(
+            FileUploadORM.user_id == user_id,
+            FileUploadORM.content_hash.in_(keys),
+        )
+        .distinct(FileUploadORM.content_hash)
+        .order_by(FileUploadORM.content_hash, FileUploadORM.thread_id != thread_id)
+        .subquery()
+    )
+    result = await session.execute(
+        select(
+            sources.c.content_hash,
+            sources.c.id,
+            FileChunkORM.text,
+            FileChunkORM.embedding,
+            FileChunkORM.metadata_json,
+        )
+        .join(FileChunkORM, FileChunkORM.file_id == sources.c.id)
+        .order_by(sources.c.content_hash, FileChunkORM.chunk_index)
+    )
+
+    known = {}
+    for key, file_id, text, embedding, metadata in result:
+        _, chunks, embeddings = known.setdefault(key, (file_id, [], []))
+        chunks.append((text, (metadata or {}).get("token_count", 0)))
+        embeddings.append(embedding)
+    return known
+
+
+async def _prepare_file(file: UploadFile, content: bytes) -> list[tuple[str, int]]:
+    """Extract and chunk one uploaded file.
+
+    Returns:
+        The file's non-blank chunks as (text, token count) pairs.
+    """
+    try:
+        # Extract text from file
+        logger.info(f"Extracting text from {file.filename}")
+        text = await file_processor.extract_text(content, file.content_type)
+
+        if not text.strip():
+            raise HTTPException(
+                422, f"Could not extract any text from '{file.filename}'"
+            )
+
+        # Chunk the text; blank chunks are dropped by embed_batch, so drop
+        # them here too to keep embeddings aligned with their chunks
+        logger.info(f"Chunking text from {file.filename}")
+        chunks = [c for c in await file_processor.chunk_text(text) if c[0].strip()]
+
+        if not chunks:
+            raise HTTPException(
+                422, f"Could not create chunks from '{file.filename}'"
+            )
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error(f"Failed to process file {file.filename}: {e}")
+        raise HTTPException(500, f"Failed to process file '{file.filename}': {str(e)}")
+
+    return chunks
+
+
 @router.post("/files/upload", response_model=List[FileUploadResponse])
 async def upload_files(
     thread_id: str = Form(...),
@@ -46,21 +149,21 @@ async def upload_files(
     - Maximum 10MB per file
     - Supported formats: PDF, TXT, DOCX, MD
     """
-    # Validate thread exists and belongs to user
-    stmt = select(ThreadORM).where(
-        ThreadORM.thread_id == thread_id,
-        ThreadORM.user_id == user.user_id,
+    # Validate thread exists and belongs to user, and count its files, in one
+    # query; no row means no such thread
+    existing_count = await session.scalar(
+        select(func.count(FileUploadORM.id))
+        .select_from(ThreadORM)
+        .outerjoin(FileUploadORM, FileUploadORM.thread_id == ThreadORM.thread_id)
+        .where(
+            ThreadORM.thread_id == thread_id,
+            ThreadORM.user_id == user.user_id,
+        )
+        .group_by(ThreadORM.thread_id)
     )
-    thread = await session.scalar(stmt)
-    if not thread:
+    if existing_count is None:
         raise HTTPException(404, f"Thread '{thread_id}' not found")
 
-    # Check existing file count
-    existing_count_stmt = select(func.count(FileUploadORM.id)).where(
-        FileUploadORM.thread_id == thread_id
-    )
-    existing_count = await session.scalar(existing_count_stmt) or 0
-
     if existing_count + len(files) > settings.MAX_UPLOAD_FILES:
         raise HTTPException(
             400,
@@ -69,121 +172,136 @@ async def upload_files(
         )
 
     # Validate files
-    max_size_bytes = settings.MAX_FILE_SIZE_MB * 1024 * 1024
+    allowed_mime_types = settings.ALLOWED_MIME_TYPES
+    max_size_bytes = settings.MAX_FILE_SIZE_MB << 20
 
     for file in files:
         # Check MIME type
-        if file.content_type not in settings.ALLOWED_MIME_TYPES:
+        if file.content_type not in allowed_mime_types:
             raise HTTPException(
                 400,
                 f"Unsupported file type: {file.content_type}. "
                 f"Supported types: PDF, TXT, DOCX, MD",
             )
 
-        # Check file size by reading content
-        content = await file.read()
-        await file.seek(0)  # Reset for later reading
-
-        if len(content) > max_size_bytes:
+        # The multipart parser has already spooled the file and recorded its
+        # size, so it does not need to be read here
+        if _upload_size(file) > max_size_bytes:
             raise HTTPException(
                 413,
                 f"File '{file.filename}' exceeds maximum size of {settings.MAX_FILE_SIZE_MB}MB",
             )
 
-    uploaded_files = []
-
-    for file in files:
-        try:
-            # Check if file already exists in thread
-            existing_stmt = select(FileUploadORM).where(
-                FileUploadORM.thread_id == thread_id,
-                FileUploadORM.filename == file.filename,
-            )
-            existing_file = await session.scalar(existing_stmt)
-            if existing_file:
-                # Delete existing file and its chunks
-                await session.execute(
-                    delete(FileChunkORM).where(FileChunkORM.file_id == existing_file.id)
-                )
-                await session.execute(
-                    delete(FileUploadORM).where(FileUploadORM.id == existing_file.id)
-                )
-                await session.commit()
-                logger.info(f"Replaced existing file: {file.filename}")
-
-            # Read file content
-            content = await file.read()
-            file_size = len(content)
-
-            # Extract text from file
-            logger.info(f"Extracting text from {file.filename}")
-            text = await file_processor.extract_text(content, file.content_type)
-
-            if not text.strip():
-                raise HTTPException(
-                    422, f"Could not extract any text from '{file.filename}'"
-                )
-
-            # Chunk the text
-            logger.info(f"Chunking text from {file.filename}")
-            chunks = file_processor.chunk_text(text)
+    # Content this user uploaded before (with the same chunking and embedding
+    # model) reuses the stored chunks and embeddings instead of being
+    # processed again
+    contents = [await file.read() for file in files]
+    keys = [_content_key(file, content) for file, content in zip(files, contents)]
+    known = await _load_known_chunks(session, user.user_id, thread_id, set(keys))
+    if known:
+        logger.info(f"Reusing stored chunks for {len(known)} file(s)")
+
+    # Extract and chunk the other files first, concurrently, so they can be
+    # embedded in one batch
+    new_chunks = await asyncio.gather(
+        *(
+            _prepare_file(file, content)
+            for file, content, key in zip(files, contents, keys)
+            if key not in known
+        )
+    )
+    all_chunks = [chunk for chunks in new_chunks for chunk, _ in chunks]
 
-            if not chunks:
-                raise HTTPException(
-                    422, f"Could not create chunks from '{file.filename}'"
-                )
+    # Generate embeddings for all chunks of all files
+    logger.info(f"Generating embeddings for {len(all_chunks)} chunks")
+    try:
+        all_embeddings = await asyncio.gather(
+            *(embedding_batcher.submit(chunk) for chunk in all_chunks)
+        )
+    except Exception as e:
+        logger.error(f"Failed to generate embeddings: {e}")
+        raise HTTPException(500, f"Failed to generate embeddings: {str(e)}")
 
-            # Generate embeddings for all chunks
-            logger.info(f"Generating embeddings for {len(chunks)} chunks")
-            embeddings = await embedding_service.embed_batch(chunks)
+    # The thread's searchable content is about to change
+    semantic_cache.invalidate(thread_id)
 
-            # Create file record
-            file_id = str(uuid4())
-            file_orm = FileUploadORM(
-                id=file_id,
+    uploaded_files = []
+    pending = iter(new_chunks)
+    offset = 0
+
+    for file, content, key in zip(files, contents, keys):
+        if key in known:
+            source_id, chunks, embeddings = known[key]
+        else:
+            source_id, chunks = None, next(pending)
+            embeddings = all_embeddings[offset : offset + len(chunks)]
+            offset += len(chunks)
+        file_size = len(content)
+        try:
+            # Create the file record, or take over the existing one with the
+            # same name; the new id is only used when there was no conflict
+            new_id = str(uuid4())
+            insert_stmt = pg_insert(FileUploadORM).values(
+                id=new_id,
                 thread_id=thread_id,
                 user_id=user.user_id,
                 filename=file.filename,
                 file_size=file_size,
                 mime_type=file.content_type,
                 chunk_count=len(chunks),
+                content_hash=key,
             )
-            session.add(file_orm)
-            # Flush to ensure the file record exists before adding chunks (for FK constraint)
-            await session.flush()
-
-            # Create chunk records with embeddings
-            for i, (chunk_text, embedding) in enumerate(zip(chunks, embeddings)):
-                chunk_orm = FileChunkORM(
-                    id=str(uuid4()),
-                    file_id=file_id,
-                    chunk_index=i,
-                    text=chunk_text,
-                    embedding=embedding,
-                    metadata_json={
-                        "filename": file.filename,
-                        "chunk_index": i,
-                        "total_chunks": len(chunks),
-                        "token_count": file_processor.count_tokens(chunk_text),
+            file_orm = await session.scalar(
+                insert_stmt.on_conflict_do_update(
+                    index_elements=[FileUploadORM.thread_id, FileUploadORM.filename],
+                    set_={
+                        "user_id": insert_stmt.excluded.user_id,
+                        "file_size": insert_stmt.excluded.file_size,
+                        "mime_type": insert_stmt.excluded.mime_type,
+                        "chunk_count": insert_stmt.excluded.chunk_count,
+                        "content_hash": insert_stmt.excluded.content_hash,
+                        "created_at": func.now(),
                     },
+                ).returning(FileUploadORM)
+            )
+            file_id = file_orm.id
+            if file_id == source_id:
+                # Same name and content as before: its chunks are still valid
+                logger.info(f"File unchanged: {file.filename}")
+            else:
+                if file_id != new_id:
+                    # Drop the replaced file's chunks
+                    await session.execute(
+                        delete(FileChunkORM).where(FileChunkORM.file_id == file_id)
+                    )
+                    logger.info(f"Replaced existing file: {file.filename}")
+
+                # Insert all chunk records with embeddings in one statement
+                await session.execute(
+                    insert(FileChunkORM),
+                    [
+                        {
+                            "id": str(uuid4()),
+                            "file_id": file_id,
+                            "chunk_index": i,
+                            "text": chunk_text,
+                            "embedding": embedding,
+                            "metadata_json": {
+                                "filename": file.filename,
+                                "chunk_index": i,
+                                "total_chunks": len(chunks),
+                                "token_count": token_count,
+                            },
+                        }
+                        for i, ((chunk_text, token_count), embedding) in enumerate(
+                            zip(chunks, embeddings)
+                        )
+                    ],
                 )
-                session.add(chunk_orm)
 
             await session.commit()
-            await session.refresh(file_orm)
-
-            uploaded_files.append(
-                FileUploadResponse(
-                    id=file_orm.id,
-                    thread_id=file_orm.thread_id,
-                    user_id=file_orm.user_id,
-                    filename=file_orm.filename,
-                    file_size=file_orm.file_size,
-                    mime_type=file_orm.mime_type,
-                    chunk_count=file_orm.chunk_count,
-                    created_at=file_orm.created_at,
-                )
-            )
+
+            uploaded_files.append(file_orm)
 
             logger.info(
                 f"Successfully uploaded {file.filename}: "
@@ -197,6 +315,7 @@ async def upload_files(
             await session.rollback()
             raise HTTPException(500, f"Failed to process file '{file.filename}': {str(e)}")
 
+    semantic_cache.invalidate(thread_id)
     return uploaded_files
 
 
@@ -207,38 +326,24 @@ async def list_files(
     session: AsyncSession = Depends(get_session),
 ):
     """List all files uploaded to a thread."""
-    # Validate thread exists and belongs to user
-    stmt = select(ThreadORM).where(
-        ThreadORM.thread_id == thread_id,
-        ThreadORM.user_id == user.user_id,
-    )
-    thread = await session.scalar(stmt)
-    if not thread:
-        raise HTTPException(404, f"Thread '{thread_id}' not found")
-
-    # Get files
-    files_stmt = (
-        select(FileUploadORM)
-        .where(FileUploadORM.thread_id == thread_id)
+    # Validate thread exists and belongs to user and fetch its files in one
+    # query; a thread without files yields a single row with no file
+    result = await session.execute(
+        select(ThreadORM.thread_id, FileUploadORM)
+        .outerjoin(FileUploadORM, FileUploadORM.thread_id == ThreadORM.thread_id)
+        .where(
+            ThreadORM.thread_id == thread_id,
+            ThreadORM.user_id == user.user_id,
+        )
         .order_by(FileUploadORM.created_at.desc())
     )
-    result = await session.execute(files_stmt)
-    files = result.scalars().all()
+    rows = result.all()
+    if not rows:
+        raise HTTPException(404, f"Thread '{thread_id}' not found")
+    files = [f for _, f in rows if f is not None]
 
     return FileListResponse(
-        files=[
-            FileUploadResponse(
-                id=f.id,
-                thread_id=f.thread_id,
-                user_id=f.user_id,
-                filename=f.filename,
-                file_size=f.file_size,
-                mime_type=f.mime_type,
-                chunk_count=f.chunk_count,
-                created_at=f.created_at,
-            )
-            for f in files
-        ],
+        files=files,
         total=len(files),
     )
 
@@ -272,6 +377,7 @@ async def delete_file(
     )
 
     await session.commit()
+    semantic_cache.invalidate(file.thread_id)
 
     logger.info(f"Deleted file {filename} (id: {file_id})")
 
@@ -290,18 +396,24 @@ async def search_files(
     session: AsyncSession = Depends(get_session),
 ):
     """Search for similar content in thread's uploaded files."""
-    # Validate thread exists and belongs to user
-    stmt = select(ThreadORM).where(
-        ThreadORM.thread_id == thread_id,
-        ThreadORM.user_id == user.user_id,
+    # Validate thread exists and belongs to user and count its chunks in one
+    # query; no row means no such thread
+    total_chunks = await session.scalar(
+        select(func.count(FileChunkORM.id))
+        .select_from(ThreadORM)
+        .outerjoin(FileUploadORM, FileUploadORM.thread_id == ThreadORM.thread_id)
+        .outerjoin(FileChunkORM, FileChunkORM.file_id == FileUploadORM.id)
+        .where(
+            ThreadORM.thread_id == thread_id,
+            ThreadORM.user_id == user.user_id,
+        )
+        .group_by(ThreadORM.thread_id)
     )
-    thread = await session.scalar(stmt)
-    if not thread:
+    if total_chunks is None:
         raise HTTPException(404, f"Thread '{thread_id}' not found")
 
     # Check if thread has files
-    has_files = await rag_service.has_files_in_thread(session, thread_id)
-    if not has_files:
+    if not total_chunks:
         return SimilaritySearchResponse(
             query=request.query,
             results=[],
@@ -313,8 +425,6 @@ async def search_files(
         session, request.query, thread_id, request.top_k
     )
 
-    total_chunks = await rag_service.get_total_chunks_in_thread(session, thread_id)
-
     return SimilaritySearchResponse(
         query=request.query,
         results=results,
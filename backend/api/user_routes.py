@@ -2,14 +2,14 @@ from datetime import timedelta
 from typing import Any, Annotated
 
 from fastapi import APIRouter, Depends, HTTPException
-from sqlalchemy import update, select
+from sqlalchemy import delete, update
 
 from core.config import settings
 from services.user_services import UserService
 
 from core.orm import get_session
 from core.orm import User as UserORM
-from utils.user_utils import get_current_user
+from utils.user_utils import get_current_user, invalidate_user_cache
 from fastapi.security import OAuth2PasswordRequestForm
 
 
@@ -66,13 +66,14 @@ async def update_user_me(
     """
     service = UserService(session)
 
-    if user_in.email:
-        existing_user = await service.get_user_by_email(email=user_in.email)
-        if existing_user and existing_user.user_id != current_user.user_id:
-            raise HTTPException(
-                status_code=409, detail="User with this email already exists"
-            )
+    if user_in.email and await service.email_taken(
+        email=user_in.email, exclude_user_id=current_user.user_id
+    ):
+        raise HTTPException(
+            status_code=409, detail="User with this email already exists"
+        )
     current_user = await service.update_user(user_in=user_in, db_user=current_user)
+    invalidate_user_cache(current_user.user_id)
     return current_user
 
 
@@ -94,8 +95,8 @@ async def update_password_me(
             status_code=400, detail="New password cannot be the same as the current one"
         )
 
+    # current_user is a detached copy, so the new hash is written directly
     hashed_password = get_password_hash(body.new_password)
-    current_user.password = hashed_password
     user_update = (
         update(UserORM)
         .where(UserORM.user_id == current_user.user_id)
@@ -105,6 +106,7 @@ async def update_password_me(
     )
     await session.execute(user_update)
     await session.commit()
+    invalidate_user_cache(current_user.user_id)
     return Message(message="Password updated successfully")
 
 
@@ -125,14 +127,12 @@ async def delete_user_me(
     """
     user_id = current_user.user_id
 
-    stmt = select(UserORM).where(UserORM.user_id == user_id)
-    user = await session.scalar(stmt)
-
-    if not user:
+    result = await session.execute(delete(UserORM).where(UserORM.user_id == user_id))
+    if not result.rowcount:
         raise HTTPException(404, f"User '{user_id}' not found")
 
-    await session.delete(user)
     await session.commit()
+    invalidate_user_cache(user_id)
     return Message(message="User deleted successfully")
 
 
@@ -269,4 +269,5 @@ async def reset_password(body: NewPassword, session=Depends(get_session)) -> Mes
     user.password = hashed_password
     session.add(user)
     await session.commit()
+    invalidate_user_cache(user.user_id)
     return Message(message="Password updated successfully")
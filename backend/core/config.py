@@ -14,6 +14,11 @@ class Settings(BaseSettings):
 
     # Database Settings
     DATABASE_URL: str
+    DB_POOL_SIZE: int = 20
+    DB_MAX_OVERFLOW: int = 10
+    # Recycle connections so their prepared-statement caches don't grow stale
+    DB_POOL_RECYCLE_SECONDS: int = 1800
+    DB_STATEMENT_CACHE_SIZE: int = 1024
 
     GPT_4_MINI_MODEL: str = "openai/gpt-4.1-mini-2025-04-14"
     GEMINI_MODEL: str = "google-genai/gemini-2.5-flash"
@@ -23,6 +28,21 @@ class Settings(BaseSettings):
     OR_GOOGLE_MODEL: str = "google/gemini-2.5-pro"
 
     ACCESS_TOKEN_EXPIRE_MINUTES: int = 60 * 24 * 8
+    # New password hashes use this passlib scheme; existing hashes of another
+    # scheme are replaced on the next successful login. "argon2" needs the
+    # argon2-cffi package installed.
+    PASSWORD_HASH_SCHEME: str = "bcrypt"
+    BCRYPT_ROUNDS: int = 12
+    # Per-worker cache of authenticated users, keyed by access token
+    USER_CACHE_SIZE: int = 10_000
+    USER_CACHE_TTL_SECONDS: int = 60
+    # Per-worker cache of assistant rows, keyed by assistant id
+    ASSISTANT_CACHE_SIZE: int = 1024
+    ASSISTANT_CACHE_TTL_SECONDS: int = 60
+    # Remember failed password checks briefly so retries skip bcrypt
+    LOGIN_NEG_CACHE: bool = True
+    LOGIN_NEG_CACHE_SIZE: int = 4096
+    LOGIN_NEG_CACHE_TTL_SECONDS: int = 60
     EMAIL_RESET_TOKEN_EXPIRE_MINUTES: int = 10  # Password reset token expires in 10 MINUTES
 
     model_config = SettingsConfigDict(
@@ -32,16 +52,32 @@ class Settings(BaseSettings):
     # Env settings for logging customization
     ENV_MODE: str = "LOCAL"
     LOG_LEVEL: str = "INFO"
+    # Error and performance reporting is off unless a DSN is set
+    SENTRY_DSN: str = ""
+    # Share of requests traced by Sentry; run requests are always traced and
+    # health checks never are
+    SENTRY_TRACES_SAMPLE_RATE: float = 0.05
+    SENTRY_PROFILE_SESSION_SAMPLE_RATE: float = 0.1
+    # Keep prompt indentation as written instead of compacting it (debugging)
+    PROMPTS_PRETTY: bool = False
+    # Route "show this as a timeline"-style requests without an LLM call
+    FAST_ROUTING: bool = True
+    # Upper bound on concurrent model requests made by the agent tools
+    MAX_CONCURRENT_MODEL_CALLS: int = 8
+    # Most node edits one /chat/modify-nodes request may ask for
+    MAX_NODE_EDITS_PER_REQUEST: int = 20
 
     # File upload settings
     MAX_UPLOAD_FILES: int = 3
     MAX_FILE_SIZE_MB: int = 10
-    ALLOWED_MIME_TYPES: list[str] = [
-        "application/pdf",
-        "text/plain",
-        "application/vnd.openxmlformats-officedocument.wordprocessingml.document",
-        "text/markdown",
-    ]
+    ALLOWED_MIME_TYPES: frozenset[str] = frozenset(
+        {
+            "application/pdf",
+            "text/plain",
+            "application/vnd.openxmlformats-officedocument.wordprocessingml.document",
+            "text/markdown",
+        }
+    )
 
     # Chunking settings
     CHUNK_SIZE: int = 1000  # tokens
@@ -51,10 +87,26 @@ class Settings(BaseSettings):
     OPENAI_API_KEY: str = ""
     EMBEDDING_MODEL: str = "text-embedding-3-small"
     EMBEDDING_DIMENSION: int = 1536
+    # Embedding requests from concurrent callers are coalesced into one API call
+    EMBED_BATCH_MAX: int = 128
+    EMBED_BATCH_WAIT_MS: int = 20
+    # Coalesced batches embedded at once; the rest wait their turn
+    EMBED_MAX_CONCURRENT_BATCHES: int = 4
+    # Recent search queries whose embeddings are kept in-process
+    QUERY_EMBED_CACHE_SIZE: int = 1024
+    # Near-duplicate search queries (cosine >= threshold) reuse earlier results;
+    # L hash tables of B-bit random-projection signatures find the candidates
+    SEMANTIC_CACHE_THRESHOLD: float = 0.95
+    SEMANTIC_CACHE_L: int = 8
+    SEMANTIC_CACHE_B: int = 8
+    SEMANTIC_CACHE_SIZE: int = 4096
+    SEMANTIC_CACHE_TTL_SECONDS: int = 300
 
     # RAG settings
     TOP_K_RESULTS: int = 3
     SIMILARITY_THRESHOLD: float = 0.5
+    # HNSW candidate list size per search; larger is more accurate and slower
+    HNSW_EF_SEARCH: int = 40
 
     # SMTP Email settings
     SMTP_HOST: str
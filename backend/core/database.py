@@ -2,6 +2,7 @@
 
 from typing import Any
 
+import orjson
 import structlog
 from langgraph.checkpoint.postgres.aio import AsyncPostgresSaver
 from langgraph.store.postgres.aio import AsyncPostgresStore
@@ -11,6 +12,15 @@ from core.config import settings
 logger = structlog.get_logger(__name__)
 
 
+def _json_serializer(obj: Any) -> str:
+    """Encode JSON/JSONB parameters with orjson.
+
+    Values wrapped in ``orjson.Fragment`` are already encoded and are
+    embedded as-is.
+    """
+    return orjson.dumps(obj, option=orjson.OPT_NON_STR_KEYS).decode()
+
+
 class DatabaseManager:
     """Manages database connections and LangGraph persistence components"""
 
@@ -27,8 +37,21 @@ class DatabaseManager:
     async def initialize(self) -> None:
         """Initialize database connections and LangGraph components"""
         # SQLAlchemy for our minimal Agent Protocol metadata tables
+        # Warm pooled connections keep their prepared statements, so repeated
+        # queries skip the Parse round trip
         self.engine = create_async_engine(
             self._database_url,
+            pool_size=settings.DB_POOL_SIZE,
+            max_overflow=settings.DB_MAX_OVERFLOW,
+            pool_recycle=settings.DB_POOL_RECYCLE_SECONDS,
+            pool_pre_ping=True,
+            json_serializer=_json_serializer,
+            json_deserializer=orjson.loads,
+            connect_args={
+                # asyncpg's own cache and SQLAlchemy's adapter-level cache
+                "statement_cache_size": settings.DB_STATEMENT_CACHE_SIZE,
+                "prepared_statement_cache_size": settings.DB_STATEMENT_CACHE_SIZE,
+            },
         )
 
         dsn = self._database_url.replace("postgresql+asyncpg://", "postgresql://")
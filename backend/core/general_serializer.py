@@ -3,6 +3,8 @@
 from abc import ABC, abstractmethod
 from typing import Any
 
+import orjson
+
 
 class Serializer(ABC):
     """Abstract base class for object serialization"""
@@ -77,4 +79,37 @@ class GeneralSerializer(Serializer):
         else:
             return str(obj)
 
+    def default(self, obj: Any) -> Any:
+        """orjson ``default`` hook covering the same types as ``_serialize_object``.
+
+        orjson walks containers itself and calls this only for values it cannot
+        encode natively, recursing into whatever is returned.
+        """
+        if hasattr(obj, "model_dump") and callable(obj.model_dump):
+            return obj.model_dump()
+        if hasattr(obj, "dict") and callable(obj.dict):
+            return obj.dict()
+        if (
+            obj.__class__.__name__ == "Interrupt"
+            and hasattr(obj, "value")
+            and hasattr(obj, "id")
+        ):
+            return {"value": obj.value, "id": obj.id}
+        if hasattr(obj, "_asdict") and callable(obj._asdict):
+            return obj._asdict()
+        if isinstance(obj, (set, frozenset)):
+            return list(obj)
+        return str(obj)
+
+    def dumps(self, obj: Any) -> bytes:
+        """Encode any object straight to JSON bytes in a single orjson pass"""
+        try:
+            return orjson.dumps(
+                obj, default=self.default, option=orjson.OPT_NON_STR_KEYS
+            )
+        except orjson.JSONEncodeError as e:
+            raise SerializationError(
+                f"Failed to serialize object: {str(e)}", obj.__class__.__name__, e
+            ) from e
+
 general_serializer = GeneralSerializer()
@@ -0,0 +1,41 @@
+"""ASGI middleware applied ahead of the FastAPI router."""
+
+from starlette.types import ASGIApp, Receive, Scope, Send
+
+HEALTH_BODY = b'{"status":"ok"}'
+
+
+class HealthCheckMiddleware:
+    """Answers ``GET /health`` with a pre-encoded body, skipping the router.
+
+    Load balancers poll this endpoint constantly, so it bypasses routing,
+    dependency resolution and response serialization entirely.
+    """
+
+    def __init__(self, app: ASGIApp, path: str = "/health"):
+        self.app = app
+        self.path = path
+        self._headers = [
+            (b"content-type", b"application/json"),
+            (b"content-length", str(len(HEALTH_BODY)).encode()),
+        ]
+        self._body = {"type": "http.response.body", "body": HEALTH_BODY}
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if (
+            scope["type"] == "http"
+            and scope["path"] == self.path
+            and scope["method"] in ("GET", "HEAD")
+        ):
+            # Fresh start message per request: outer middleware such as CORS
+            # appends to its headers list in place
+            await send(
+                {
+                    "type": "http.response.start",
+                    "status": 200,
+                    "headers": list(self._headers),
+                }
+            )
+            await send(self._body)
+            return
+        await self.app(scope, receive, send)
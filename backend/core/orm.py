@@ -5,6 +5,7 @@ This module creates:
 • `Assistant`, `Thread`, `Run` – ORM models mirroring the bootstrap tables
   already created in ``DatabaseManager._create_metadata_tables``.
 • `FileUpload`, `FileChunk` – ORM models for file upload and RAG functionality.
+• `PasswordResetCode` – pending password reset codes.
 • `async_session_maker` – a factory that hands out `AsyncSession` objects
   bound to the shared engine managed by `db_manager`.
 • `get_session` – FastAPI dependency helper for routers.
@@ -21,14 +22,16 @@ from uuid import uuid4
 from sqlalchemy import (
     TIMESTAMP,
     BigInteger,
+    Boolean,
     ForeignKey,
     Index,
     Integer,
     Text,
+    func,
     text,
 )
 from sqlalchemy.dialects.postgresql import JSONB, UUID
-from pgvector.sqlalchemy import Vector
+from pgvector.sqlalchemy import HALFVEC
 from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
 from sqlalchemy.orm import Mapped, declarative_base, mapped_column
 
@@ -96,11 +99,19 @@ class Thread(Base):
         TIMESTAMP(timezone=True), server_default=text("now()")
     )
     updated_at: Mapped[datetime] = mapped_column(
-        TIMESTAMP(timezone=True), server_default=text("now()")
+        TIMESTAMP(timezone=True), server_default=text("now()"), onupdate=func.now()
     )
 
     # Indexes for performance
-    __table_args__ = (Index("idx_thread_user", "user_id"),)
+    __table_args__ = (
+        Index("idx_thread_user", "user_id"),
+        Index(
+            "idx_thread_metadata",
+            "metadata_json",
+            postgresql_using="gin",
+            postgresql_ops={"metadata_json": "jsonb_path_ops"},
+        ),
+    )
 
 
 class User(Base):
@@ -119,6 +130,21 @@ class User(Base):
     )
 
 
+class PasswordResetCode(Base):
+    """Pending password reset code, shared by every worker."""
+
+    __tablename__ = "password_reset_code"
+
+    email: Mapped[str] = mapped_column(Text, primary_key=True)
+    code: Mapped[str] = mapped_column(Text, nullable=False)
+    verified: Mapped[bool] = mapped_column(
+        Boolean, nullable=False, server_default=text("false")
+    )
+    expires_at: Mapped[datetime] = mapped_column(
+        TIMESTAMP(timezone=True), nullable=False
+    )
+
+
 class Run(Base):
     __tablename__ = "runs"
 
@@ -147,7 +173,7 @@ class Run(Base):
         TIMESTAMP(timezone=True), server_default=text("now()")
     )
     updated_at: Mapped[datetime] = mapped_column(
-        TIMESTAMP(timezone=True), server_default=text("now()")
+        TIMESTAMP(timezone=True), server_default=text("now()"), onupdate=func.now()
     )
 
     # Indexes for performance
@@ -158,6 +184,8 @@ class Run(Base):
         Index("idx_runs_assistant_id", "assistant_id"),
         Index("idx_runs_created_at", "created_at"),
     )
+    # Fetch server-generated timestamps with RETURNING on insert
+    __mapper_args__ = {"eager_defaults": True}
 
 
 class RunEvent(Base):
@@ -197,6 +225,9 @@ class FileUpload(Base):
     file_size: Mapped[int] = mapped_column(BigInteger, nullable=False)
     mime_type: Mapped[str | None] = mapped_column(Text, nullable=True)
     chunk_count: Mapped[int] = mapped_column(Integer, default=0)
+    # sha256 of the content and the chunking/embedding settings; the same
+    # user's uploads with a known hash reuse the stored chunks
+    content_hash: Mapped[str | None] = mapped_column(Text, nullable=True)
     created_at: Mapped[datetime] = mapped_column(
         TIMESTAMP(timezone=True), server_default=text("now()")
     )
@@ -205,6 +236,7 @@ class FileUpload(Base):
         Index("idx_file_upload_thread", "thread_id"),
         Index("idx_file_upload_user", "user_id"),
         Index("idx_file_upload_unique", "thread_id", "filename", unique=True),
+        Index("idx_file_upload_user_content_hash", "user_id", "content_hash"),
     )
 
 
@@ -221,7 +253,10 @@ class FileChunk(Base):
     )
     chunk_index: Mapped[int] = mapped_column(Integer, nullable=False)
     text: Mapped[str] = mapped_column(Text, nullable=False)
-    embedding = mapped_column(Vector(1536), nullable=True)  # OpenAI embedding dimension
+    # OpenAI embedding dimension, stored as half precision: half the size of
+    # vector(1536) with no measurable loss in cosine ranking. Deferred so
+    # loading chunk rows never pulls the vector unless it is asked for.
+    embedding = mapped_column(HALFVEC(1536), nullable=True, deferred=True)
     metadata_json: Mapped[dict | None] = mapped_column(JSONB, nullable=True)
 
 
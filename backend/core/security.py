@@ -1,3 +1,6 @@
+import hashlib
+import time
+from collections import OrderedDict
 from datetime import datetime, timedelta, timezone
 from typing import Any
 
@@ -7,7 +10,24 @@ from passlib.context import CryptContext
 
 from core.config import settings
 
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+# bcrypt stays in the list so existing hashes keep verifying; "auto" marks
+# every scheme but the configured one as deprecated
+_password_schemes = list(dict.fromkeys([settings.PASSWORD_HASH_SCHEME, "bcrypt"]))
+_argon2_settings = (
+    {
+        "argon2__time_cost": 2,
+        "argon2__memory_cost": 19 * 1024,
+        "argon2__parallelism": 1,
+    }
+    if "argon2" in _password_schemes
+    else {}
+)
+pwd_context = CryptContext(
+    schemes=_password_schemes,
+    deprecated="auto",
+    bcrypt__rounds=settings.BCRYPT_ROUNDS,
+    **_argon2_settings,
+)
 
 
 ALGORITHM = "HS256"
@@ -20,14 +40,44 @@ def create_access_token(subject: str | Any, expires_delta: timedelta) -> str:
     return encoded_jwt
 
 
+# Digests of (password, hash) pairs that recently failed to verify, mapped to
+# their expiry. Only failures are kept: a success is never served from here,
+# and a changed hash produces a different key.
+_failed_checks: OrderedDict[bytes, float] = OrderedDict()
+
+
 def verify_password(plain_password: str, hashed_password: str) -> bool:
-    return pwd_context.verify(plain_password, hashed_password)
+    if not settings.LOGIN_NEG_CACHE:
+        return pwd_context.verify(plain_password, hashed_password)
+
+    key = hashlib.blake2b(
+        f"{plain_password}\0{hashed_password}".encode(), digest_size=16
+    ).digest()
+    now = time.monotonic()
+    expires_at = _failed_checks.get(key)
+    if expires_at is not None:
+        if expires_at > now:
+            return False
+        del _failed_checks[key]
+
+    if pwd_context.verify(plain_password, hashed_password):
+        return True
+
+    _failed_checks[key] = now + settings.LOGIN_NEG_CACHE_TTL_SECONDS
+    if len(_failed_checks) > settings.LOGIN_NEG_CACHE_SIZE:
+        _failed_checks.popitem(last=False)
+    return False
 
 
 def get_password_hash(password: str) -> str:
     return pwd_context.hash(password)
 
 
+def password_needs_rehash(hashed_password: str) -> bool:
+    """Return whether a hash uses a scheme or cost other than the configured one."""
+    return pwd_context.needs_update(hashed_password)
+
+
 async def verify_password_reset_token(token: str) -> str | None:
     try:
         decoded_token = jwt.decode(token, settings.SECRET_KEY, algorithms=[ALGORITHM])
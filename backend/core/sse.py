@@ -2,9 +2,12 @@
 
 import json
 from datetime import datetime
-from typing import Dict, Any, Optional
+from types import MappingProxyType
+from typing import Dict, Any, Mapping, Optional
 from dataclasses import dataclass
 
+import orjson
+
 
 def _serialize_message_object(obj):
     """Custom serializer for LangChain message objects"""
@@ -29,15 +32,23 @@ def _serialize_message_object(obj):
         return str(obj)
 
 
-def get_sse_headers() -> Dict[str, str]:
-    """Get standard SSE headers"""
-    return {
+# Shared by every stream; read-only so no response can alter it for the others
+SSE_HEADERS: Mapping[str, str] = MappingProxyType(
+    {
         "Cache-Control": "no-cache",
         "Connection": "keep-alive",
         "Content-Type": "text/event-stream",
         "Access-Control-Allow-Origin": "*",
         "Access-Control-Allow-Headers": "Last-Event-ID",
+        # Stop nginx-style proxies from buffering the stream
+        "X-Accel-Buffering": "no",
     }
+)
+
+
+def get_sse_headers() -> Mapping[str, str]:
+    """Get standard SSE headers (read-only; copy before modifying)"""
+    return SSE_HEADERS
 
 
 def format_sse_message(event: str, data: Any, event_id: Optional[str] = None) -> str:
@@ -53,9 +64,13 @@ def format_sse_message(event: str, data: Any, event_id: Optional[str] = None) ->
     if data is None:
         data_str = ""
     else:
-        data_str = json.dumps(
-            data, default=_serialize_message_object, separators=(",", ":")
-        )
+        # orjson emits compact JSON and handles datetimes/UUIDs natively; the
+        # frame stays str because the broker and event store consume str.
+        data_str = orjson.dumps(
+            data,
+            default=_serialize_message_object,
+            option=orjson.OPT_NON_STR_KEYS,
+        ).decode()
 
     lines.append(f"data: {data_str}")
     lines.append("")  # Empty line to end the event
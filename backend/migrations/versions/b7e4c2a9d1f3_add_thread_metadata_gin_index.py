@@ -0,0 +1,33 @@
+"""Add GIN index on thread metadata for containment search
+
+Revision ID: b7e4c2a9d1f3
+Revises: a1b2c3d4e5f6
+Create Date: 2026-10-15 12:00:00.000000
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "b7e4c2a9d1f3"
+down_revision: Union[str, None] = "a1b2c3d4e5f6"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # jsonb_path_ops only supports @>, which is all chat search uses,
+    # and is smaller and faster than the default jsonb_ops
+    op.create_index(
+        "idx_thread_metadata",
+        "thread",
+        ["metadata_json"],
+        postgresql_using="gin",
+        postgresql_ops={"metadata_json": "jsonb_path_ops"},
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("idx_thread_metadata", table_name="thread")
@@ -0,0 +1,51 @@
+"""Store file chunk embeddings as halfvec
+
+Revision ID: c3f8a1d5e7b2
+Revises: b7e4c2a9d1f3
+Create Date: 2026-10-15 18:00:00.000000
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "c3f8a1d5e7b2"
+down_revision: Union[str, None] = "b7e4c2a9d1f3"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # halfvec needs pgvector >= 0.7.0. The IVFFlat index is tied to the column
+    # type's operator class, so it is rebuilt around the conversion.
+    op.drop_index("idx_file_chunk_embedding", table_name="file_chunk")
+    op.execute(
+        "ALTER TABLE file_chunk "
+        "ALTER COLUMN embedding TYPE halfvec(1536) USING embedding::halfvec(1536)"
+    )
+    op.execute(
+        """
+        CREATE INDEX idx_file_chunk_embedding
+        ON file_chunk
+        USING ivfflat (embedding halfvec_cosine_ops)
+        WITH (lists = 100)
+        """
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("idx_file_chunk_embedding", table_name="file_chunk")
+    op.execute(
+        "ALTER TABLE file_chunk "
+        "ALTER COLUMN embedding TYPE vector(1536) USING embedding::vector(1536)"
+    )
+    op.execute(
+        """
+        CREATE INDEX idx_file_chunk_embedding
+        ON file_chunk
+        USING ivfflat (embedding vector_cosine_ops)
+        WITH (lists = 100)
+        """
+    )
@@ -0,0 +1,44 @@
+"""Index file chunk embeddings with HNSW
+
+Revision ID: d9a4e6b1c8f0
+Revises: c3f8a1d5e7b2
+Create Date: 2026-10-15 22:30:00.000000
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "d9a4e6b1c8f0"
+down_revision: Union[str, None] = "c3f8a1d5e7b2"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Searches are filtered by thread and rely on hnsw.iterative_scan, which
+    # needs pgvector >= 0.8.0. Unlike IVFFlat, HNSW needs no training data, so
+    # the index stays accurate as chunks are added to an initially empty table.
+    op.drop_index("idx_file_chunk_embedding", table_name="file_chunk")
+    op.execute(
+        """
+        CREATE INDEX idx_file_chunk_embedding
+        ON file_chunk
+        USING hnsw (embedding halfvec_cosine_ops)
+        WITH (m = 16, ef_construction = 64)
+        """
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("idx_file_chunk_embedding", table_name="file_chunk")
+    op.execute(
+        """
+        CREATE INDEX idx_file_chunk_embedding
+        ON file_chunk
+        USING ivfflat (embedding halfvec_cosine_ops)
+        WITH (lists = 100)
+        """
+    )
@@ -0,0 +1,34 @@
+"""Add content hash to file uploads
+
+Revision ID: e2b7f5a3d9c1
+Revises: d9a4e6b1c8f0
+Create Date: 2026-10-15 23:00:00.000000
+
+"""
+
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "e2b7f5a3d9c1"
+down_revision: Union[str, None] = "d9a4e6b1c8f0"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Existing uploads keep a NULL hash and are simply never reused
+    op.add_column("file_upload", sa.Column("content_hash", sa.Text(), nullable=True))
+    # Lookups are always scoped to the uploading user
+    op.create_index(
+        "idx_file_upload_user_content_hash",
+        "file_upload",
+        ["user_id", "content_hash"],
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("idx_file_upload_user_content_hash", table_name="file_upload")
+    op.drop_column("file_upload", "content_hash")
@@ -0,0 +1,34 @@
+"""Add password reset code table
+
+Revision ID: f6c1d8e4a2b9
+Revises: e2b7f5a3d9c1
+Create Date: 2026-10-15 23:30:00.000000
+
+"""
+
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "f6c1d8e4a2b9"
+down_revision: Union[str, None] = "e2b7f5a3d9c1"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "password_reset_code",
+        sa.Column("email", sa.Text(), primary_key=True),
+        sa.Column("code", sa.Text(), nullable=False),
+        sa.Column(
+            "verified", sa.Boolean(), nullable=False, server_default=sa.text("false")
+        ),
+        sa.Column("expires_at", sa.TIMESTAMP(timezone=True), nullable=False),
+    )
+
+
+def downgrade() -> None:
+    op.drop_table("password_reset_code")
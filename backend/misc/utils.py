@@ -2,17 +2,27 @@ from __future__ import annotations
 
 import asyncio
 import copy
-from datetime import datetime, timezone
+import random
+import time
+from collections import OrderedDict
 from uuid import uuid5
 
+import orjson
 import structlog
 from sqlalchemy import update, select
 from sqlalchemy.ext.asyncio import AsyncSession
-from typing import TypeVar, Callable, Awaitable, Optional, Dict, Mapping, Any
+from typing import TypeVar, Callable, Awaitable, Optional, Mapping, Any
 from fastapi import HTTPException
 
+from core.config import settings
 from misc.constants import ASSISTANT_NAMESPACE_UUID
-from core.orm import Thread as ThreadORM, _get_session_maker, Run as RunORM
+from core.orm import (
+    Assistant as AssistantORM,
+    Thread as ThreadORM,
+    _get_session_maker,
+    Run as RunORM,
+)
+from models.assistants import Assistant
 from models.users import User
 from misc.active_runs import active_runs
 from services.langgraph_service import get_langgraph_service, create_run_config
@@ -28,11 +38,19 @@ DEFAULT_STREAM_MODES = ["values"]
 
 logger = structlog.getLogger(__name__)
 
+# Assistants are only created at startup and never modified through the API,
+# so rows are kept in-process once read. Entries expire so changes made
+# outside the API are still picked up. Keyed by assistant_id; values are
+# (expires_at, assistant).
+_assistant_cache: OrderedDict[str, tuple[float, Assistant]] = OrderedDict()
+
 
 async def retry(
     fn: Callable[[], Awaitable[T]],
     max_attempts: int = 3,
-    delay_seconds: int = 1,
+    delay_seconds: float = 1,
+    max_delay_seconds: float = 30,
+    retry_on: tuple[type[Exception], ...] = (Exception,),
 ) -> T:
     """
     Retry an async function with exponential backoff.
@@ -40,13 +58,18 @@ async def retry(
     Args:
         fn: The async function to retry
         max_attempts: Maximum number of attempts
-        delay_seconds: Delay between attempts in seconds
+        delay_seconds: Base delay before the first retry, doubled after each
+            attempt; a random jitter of up to the same amount is added
+        max_delay_seconds: Upper bound on any single delay
+        retry_on: Exception types worth retrying; anything else is raised
+            immediately
 
     Returns:
         The result of the function call
 
     Raises:
-        The last exception if all attempts fail
+        The last exception if all attempts fail, or the first one that is not
+        in ``retry_on``
 
     Example:
     ```python
@@ -65,17 +88,22 @@ async def retry(
         raise ValueError("max_attempts must be greater than zero")
 
     last_error: Optional[Exception] = None
+    delay = delay_seconds
 
     for attempt in range(1, max_attempts + 1):
         try:
             return await fn()
-        except Exception as error:
+        except retry_on as error:
             last_error = error
 
             if attempt == max_attempts:
                 break
 
-            await asyncio.sleep(delay_seconds)
+            # Jitter keeps callers that failed together from retrying together
+            await asyncio.sleep(
+                min(max_delay_seconds, delay + random.uniform(0, delay))
+            )
+            delay *= 2
 
     if last_error:
         raise last_error
@@ -83,47 +111,23 @@ async def retry(
     raise RuntimeError("Unexpected: last_error is None")
 
 
-def get_sse_headers() -> Dict[str, str]:
-    """Get standard SSE headers"""
-    return {
-        "Cache-Control": "no-cache",
-        "Connection": "keep-alive",
-        "Content-Type": "text/event-stream",
-        "Access-Control-Allow-Origin": "*",
-        "Access-Control-Allow-Headers": "Last-Event-ID",
-    }
-
-
-async def set_thread_status(session: AsyncSession, thread_id: str, status: str):
-    """Update the status column of a thread."""
-    await session.execute(
-        update(ThreadORM)
-        .where(ThreadORM.thread_id == thread_id)
-        .values(status=status, updated_at=datetime.now(timezone.utc))
-    )
-    await session.commit()
-
+async def mark_thread_busy(session: AsyncSession, thread_id: str) -> dict:
+    """Mark a thread busy and return its metadata, without committing.
 
-async def update_thread_metadata(session: AsyncSession, thread_id: str):
-    """Update thread metadata with assistant and graph information (dialect agnostic)."""
-    # Read-modify-write to avoid DB-specific JSON concat operators
-    thread = await session.scalar(
-        select(ThreadORM).where(ThreadORM.thread_id == thread_id)
-    )
-    if not thread:
+    The caller commits together with the run insert, so a run rejected during
+    validation does not leave the thread busy.
+    """
+    row = (
+        await session.execute(
+            update(ThreadORM)
+            .where(ThreadORM.thread_id == thread_id)
+            .values(status="busy")
+            .returning(ThreadORM.metadata_json)
+        )
+    ).first()
+    if row is None:
         raise HTTPException(404, f"Thread '{thread_id}' not found for metadata update")
-    md = dict(getattr(thread, "metadata_json", {}) or {})
-    # md.update({
-    #     "graph_id": graph_id,
-    # })
-    await session.execute(
-        update(ThreadORM)
-        .where(ThreadORM.thread_id == thread_id)
-        .values(metadata_json=md, updated_at=datetime.now(timezone.utc))
-    )
-    await session.commit()
-
-    return md
+    return dict(row.metadata_json or {})
 
 
 async def inject_rag_context(
@@ -202,11 +206,11 @@ async def inject_rag_context(
                         content[0] = f"{rag_context}\n\nUser Query: {first_content}"
                 break
         
-        logger.info(f"Injected RAG context for thread {thread_id}")
+        logger.info("Injected RAG context", thread_id=thread_id)
         return modified_input
         
     except Exception as e:
-        logger.warning(f"Failed to inject RAG context: {e}")
+        logger.warning("Failed to inject RAG context", error=str(e))
         # Return original input if RAG fails
         return input_data
 
@@ -236,21 +240,12 @@ async def execute_run_async(
     # Inject RAG context from uploaded files
     input_data = await inject_rag_context(session, thread_id, input_data)
 
-    # Normalize stream_mode once here for all callers/endpoints.
-    # Accept "messages-tuple" as an alias of "messages".
-    def _normalize_mode(mode: str | None) -> str | None:
-        return (
-            "messages" if isinstance(mode, str) and mode == "messages-tuple" else mode
-        )
-
-    if isinstance(stream_mode, list):
-        stream_mode = [_normalize_mode(m) for m in stream_mode]
-    else:
-        stream_mode = _normalize_mode(stream_mode)
-
     try:
-        # Update status
-        await update_run_status(run_id, "running", session=session)
+        # Mark the run running without holding up the graph on the commit
+        mark_running = asyncio.create_task(mark_run_running(run_id))
+        _background_tasks.add(mark_running)
+        mark_running.add_done_callback(_background_tasks.discard)
+        mark_running.add_done_callback(_log_task_failure)
 
         # Get graph and execute
         langgraph_service = get_langgraph_service()
@@ -279,13 +274,18 @@ async def execute_run_async(
         final_output = None
         has_interrupt = False
 
-        # Prepare stream modes for execution
+        # Prepare stream modes for execution, in a fresh list. Normalized here
+        # for all callers/endpoints: "messages-tuple" is an alias of "messages".
         if stream_mode is None:
-            final_stream_modes = DEFAULT_STREAM_MODES.copy()
+            final_stream_modes = list(DEFAULT_STREAM_MODES)
         elif isinstance(stream_mode, str):
-            final_stream_modes = [stream_mode]
+            final_stream_modes = [
+                "messages" if stream_mode == "messages-tuple" else stream_mode
+            ]
         else:
-            final_stream_modes = stream_mode.copy()
+            final_stream_modes = [
+                "messages" if m == "messages-tuple" else m for m in stream_mode
+            ]
 
         # Ensure interrupt events are captured by including updates mode
         # Track whether updates was explicitly requested by user
@@ -293,6 +293,8 @@ async def execute_run_async(
         if not user_requested_updates:
             final_stream_modes.append("updates")
 
+        publish_event = streaming_service.publish_event
+
         async for raw_event in graph.astream(
             input_data,
             config=run_config,
@@ -303,86 +305,56 @@ async def execute_run_async(
             event_counter += 1
             event_id = f"{run_id}_event_{event_counter}"
 
-            # Forward to broker for live consumers
-            await streaming_service.put_to_broker(
-                run_id,
-                event_id,
-                raw_event,
-            )
-            # Store for replay
-            await streaming_service.store_event_from_raw(
-                run_id,
-                event_id,
-                raw_event,
-            )
+            # Forward to live consumers and store for replay
+            await publish_event(run_id, event_id, raw_event)
 
-            # Check for interrupt in this event
-            event_data = None
-            if isinstance(raw_event, tuple) and len(raw_event) >= 2:
-                event_data = raw_event[1]
-            elif not isinstance(raw_event, tuple):
-                event_data = raw_event
+            # Multi-mode events are (mode, data); a bare event is values mode
+            if isinstance(raw_event, tuple):
+                if len(raw_event) < 2:
+                    continue
+                mode, event_data = raw_event[0], raw_event[1]
+            else:
+                mode, event_data = "values", raw_event
 
+            # Check for interrupt in this event
             if isinstance(event_data, dict) and "__interrupt__" in event_data:
                 has_interrupt = True
 
             # Track final output
-            if isinstance(raw_event, tuple):
-                if len(raw_event) >= 2 and raw_event[0] == "values":
-                    final_output = raw_event[1]
-            elif not isinstance(raw_event, tuple):
-                # Non-tuple events are values mode
-                final_output = raw_event
+            if mode == "values":
+                final_output = event_data
 
         if has_interrupt:
-            await update_run_status(
+            await finalize_run(
+                session,
                 run_id,
+                thread_id,
+                "interrupted",
                 "interrupted",
                 output=final_output or {},
-                session=session,
             )
-            if not session:
-                raise RuntimeError(
-                    f"No database session available to update thread {thread_id} status"
-                )
-            await set_thread_status(session, thread_id, "interrupted")
-
         else:
-            # Update with results
-            await update_run_status(
+            # Store the results and mark the thread back to idle
+            await finalize_run(
+                session,
                 run_id,
+                thread_id,
                 "completed",
+                "idle",
                 output=final_output or {},
-                session=session,
             )
-            # Mark thread back to idle
-            if not session:
-                raise RuntimeError(
-                    f"No database session available to update thread {thread_id} status"
-                )
-            await set_thread_status(session, thread_id, "idle")
 
     except asyncio.CancelledError:
         # Store empty output to avoid JSON serialization issues
-        await update_run_status(run_id, "cancelled", output={}, session=session)
-        if not session:
-            raise RuntimeError(
-                f"No database session available to update thread {thread_id} status"
-            ) from None
-        await set_thread_status(session, thread_id, "idle")
+        await finalize_run(session, run_id, thread_id, "cancelled", "idle", output={})
         # Signal cancellation to broker
         await streaming_service.signal_run_cancelled(run_id)
         raise
     except Exception as e:
         # Store empty output to avoid JSON serialization issues
-        await update_run_status(
-            run_id, "failed", output={}, error=str(e), session=session
+        await finalize_run(
+            session, run_id, thread_id, "failed", "idle", output={}, error=str(e)
         )
-        if not session:
-            raise RuntimeError(
-                f"No database session available to update thread {thread_id} status"
-            ) from None
-        await set_thread_status(session, thread_id, "idle")
         # Signal error to broker
         await streaming_service.signal_run_error(run_id, str(e))
         raise
@@ -392,6 +364,85 @@ async def execute_run_async(
         active_runs.pop(run_id, None)
 
 
+# Fire-and-forget tasks, referenced until they finish
+_background_tasks: set[asyncio.Task] = set()
+
+
+def _run_status_values(
+    run_id: str, status: str, output=None, error: str = None
+) -> dict:
+    """Build the column values for a run status update."""
+    values = {"status": status}
+    if output is not None:
+        # Encode once here; the engine's JSON serializer embeds the
+        # fragment without walking the output again
+        try:
+            values["output"] = orjson.Fragment(general_serializer.dumps(output))
+        except Exception as e:
+            logger.warning("Failed to serialize output", run_id=run_id, error=str(e))
+            values["output"] = {
+                "error": "Output serialization failed",
+                "original_type": str(type(output)),
+            }
+    if error is not None:
+        values["error_message"] = error
+    return values
+
+
+def _log_task_failure(task: asyncio.Task) -> None:
+    """Done callback that logs the exception of a fire-and-forget task."""
+    if not task.cancelled() and task.exception() is not None:
+        logger.error(
+            "Background task failed",
+            task=task.get_name(),
+            error=str(task.exception()),
+        )
+
+
+async def mark_run_running(run_id: str) -> None:
+    """Move a newly created run to running in its own short-lived session.
+
+    This runs alongside the graph, so it only touches a run that is still in
+    its initial status (pending, or streaming for streamed runs) and never
+    overwrites a final status committed before it.
+    """
+    maker = _get_session_maker()
+    async with maker() as session:
+        await session.execute(
+            update(RunORM)
+            .where(
+                RunORM.run_id == run_id,
+                RunORM.status.in_(("pending", "streaming")),
+            )
+            .values(status="running")
+        )
+        await session.commit()
+
+
+async def finalize_run(
+    session: AsyncSession,
+    run_id: str,
+    thread_id: str,
+    status: str,
+    thread_status: str,
+    output=None,
+    error: str = None,
+) -> None:
+    """Store a run's final status and release its thread in one transaction."""
+    await session.execute(
+        update(RunORM)
+        .where(RunORM.run_id == run_id)
+        .values(**_run_status_values(run_id, status, output, error))
+    )
+    await session.execute(
+        update(ThreadORM)
+        .where(ThreadORM.thread_id == thread_id)
+        .values(status=thread_status)
+    )
+    await session.commit()
+    logger.info("Run finalized", run_id=run_id, status=status)
+
+
 async def update_run_status(
     run_id: str,
     status: str,
@@ -402,38 +453,67 @@ async def update_run_status(
     """Update run status in database (persisted). If session not provided, opens a short-lived session."""
     owns_session = False
     if session is None:
-        logger.info(f"Session created in update_run_status for run_id={run_id}")
+        logger.info("Session created in update_run_status", run_id=run_id)
         maker = _get_session_maker()
         session = maker()  # type: ignore[assignment]
         owns_session = True
     try:
-        values = {"status": status, "updated_at": datetime.now(timezone.utc)}
-        if output is not None:
-            # Serialize output to ensure JSON compatibility
-            try:
-                serialized_output = general_serializer.serialize(output)
-                values["output"] = serialized_output
-            except Exception as e:
-                logger.warning(f"Failed to serialize output for run {run_id}: {e}")
-                values["output"] = {
-                    "error": "Output serialization failed",
-                    "original_type": str(type(output)),
-                }
-        if error is not None:
-            values["error_message"] = error
-        logger.info(f"[update_run_status] owns_session={owns_session}")
-        logger.info(f"[update_run_status] updating DB run_id={run_id} status={status}")
+        values = _run_status_values(run_id, status, output, error)
+        logger.info(
+            "[update_run_status] updating DB",
+            run_id=run_id,
+            status=status,
+            owns_session=owns_session,
+        )
         await session.execute(
             update(RunORM).where(RunORM.run_id == str(run_id)).values(**values)
         )  # type: ignore[arg-type]
         await session.commit()
-        logger.info(f"[update_run_status] commit done run_id={run_id}")
+        logger.info("[update_run_status] commit done", run_id=run_id)
     finally:
         # Close only if we created it here
         if owns_session:
             await session.close()  # type: ignore[func-returns-value]
 
 
+async def get_assistant(
+    session: AsyncSession, assistant_id: str, user_id: str
+) -> Optional[Assistant]:
+    """Fetch an assistant owned by the user or by the system.
+
+    Args:
+        session: Database session, used only on a cache miss.
+        assistant_id: Resolved assistant id.
+        user_id: The requesting user.
+
+    Returns:
+        The assistant, or None if it does not exist or is not visible to the user.
+    """
+    now = time.monotonic()
+    cached = _assistant_cache.get(assistant_id)
+    if cached is not None and cached[0] > now:
+        _assistant_cache.move_to_end(assistant_id)
+        assistant = cached[1]
+    else:
+        assistant_orm = await session.scalar(
+            select(AssistantORM).where(AssistantORM.assistant_id == assistant_id)
+        )
+        if assistant_orm is None:
+            _assistant_cache.pop(assistant_id, None)
+            return None
+        assistant = Assistant.model_validate(assistant_orm)
+        _assistant_cache[assistant_id] = (
+            now + settings.ASSISTANT_CACHE_TTL_SECONDS,
+            assistant,
+        )
+        _assistant_cache.move_to_end(assistant_id)
+        if len(_assistant_cache) > settings.ASSISTANT_CACHE_SIZE:
+            _assistant_cache.popitem(last=False)
+    if assistant.user_id not in (user_id, "system"):
+        return None
+    return assistant
+
+
 def resolve_assistant_id(
     requested_id: str, available_graphs: Mapping[str, object]
 ) -> str:
@@ -458,9 +538,14 @@ def resolve_assistant_id(
 
 
 def _merge_jsonb(*objects: dict) -> dict:
-    """Mimics PostgreSQL's JSONB merge behavior"""
+    """Mimics PostgreSQL's JSONB merge behavior.
+
+    Like ``||`` this is a top-level merge, so nested values are shared with the
+    inputs rather than copied. Callers must not mutate them in place;
+    ``create_run_config`` already deep-copies the config it extends.
+    """
     result = {}
     for obj in objects:
         if obj is not None:
-            result.update(copy.deepcopy(obj))
+            result.update(obj)
     return result
@@ -3,7 +3,9 @@
 from datetime import datetime
 from typing import Any
 
-from pydantic import BaseModel, Field
+from pydantic import AliasChoices, BaseModel, Field
+
+from core.config import settings
 
 
 class ThreadCreate(BaseModel):
@@ -23,7 +25,12 @@ class Thread(BaseModel):
     assistant_id: str
     # graph_id: str
     status: str = "idle"
-    metadata: dict[str, Any] = Field(default_factory=dict)
+    # ORM rows expose the column as metadata_json (their .metadata is the
+    # SQLAlchemy MetaData), so that name is tried first.
+    metadata: dict[str, Any] = Field(
+        default_factory=dict,
+        validation_alias=AliasChoices("metadata_json", "metadata"),
+    )
     user_id: str
     created_at: datetime
 
@@ -135,3 +142,21 @@ class ModifyNodeResponse(BaseModel):
 
     modified_content: str = Field(..., description="The modified node content of the node")
     success: bool = Field(True, description="Whether the modification was successful or not")
+
+
+class ModifyNodesRequest(BaseModel):
+    """Request model for modifying several nodes' content in one call"""
+
+    edits: list[ModifyNodeRequest] = Field(
+        ...,
+        min_length=1,
+        max_length=settings.MAX_NODE_EDITS_PER_REQUEST,
+        description="Node edits to apply",
+    )
+
+
+class ModifyNodesResponse(BaseModel):
+    """Response model for batched node modification"""
+
+    modified_contents: list[str] = Field(..., description="The modified content of each node, in request order")
+    success: bool = Field(True, description="Whether the modifications were successful or not")
@@ -20,7 +20,9 @@ class RunBroker:
         """Put an event into the broker queue"""
         if self.finished.is_set():
             logger.warning(
-                f"Attempted to put event {event_id} into finished broker for run {self.run_id}"
+                "Attempted to put event into finished broker",
+                event_id=event_id,
+                run_id=self.run_id,
             )
             return
 
@@ -57,7 +59,7 @@ class RunBroker:
     def mark_finished(self) -> None:
         """Mark this broker as finished"""
         self.finished.set()
-        logger.debug(f"Broker for run {self.run_id} marked as finished")
+        logger.debug("Broker marked as finished", run_id=self.run_id)
 
     def is_finished(self) -> bool:
         """Check if this broker is finished"""
@@ -83,7 +85,7 @@ class BrokerManager:
         """Get or create a broker for a run"""
         if run_id not in self._brokers:
             self._brokers[run_id] = RunBroker(run_id)
-            logger.debug(f"Created new broker for run {run_id}")
+            logger.debug("Created new broker", run_id=run_id)
         return self._brokers[run_id]
 
     def get_broker(self, run_id: str) -> RunBroker | None:
@@ -95,14 +97,14 @@ class BrokerManager:
         if run_id in self._brokers:
             self._brokers[run_id].mark_finished()
             # Don't immediately delete in case there are still consumers
-            logger.debug(f"Marked broker for run {run_id} for cleanup")
+            logger.debug("Marked broker for cleanup", run_id=run_id)
 
     def remove_broker(self, run_id: str) -> None:
         """Remove a broker completely"""
         if run_id in self._brokers:
             self._brokers[run_id].mark_finished()
             del self._brokers[run_id]
-            logger.debug(f"Removed broker for run {run_id}")
+            logger.debug("Removed broker", run_id=run_id)
 
     async def start_cleanup_task(self) -> None:
         """Start background cleanup task for old brokers"""
@@ -137,12 +139,12 @@ class BrokerManager:
 
                 for run_id in to_remove:
                     self.remove_broker(run_id)
-                    logger.info(f"Cleaned up old broker for run {run_id}")
+                    logger.info("Cleaned up old broker", run_id=run_id)
 
             except asyncio.CancelledError:
                 break
             except Exception as e:
-                logger.error(f"Error in broker cleanup task: {e}")
+                logger.error("Error in broker cleanup task", error=str(e))
 
 
 # Global broker manager instance
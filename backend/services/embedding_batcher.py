@@ -0,0 +1,108 @@
+"""Cross-request batching for embedding requests."""
+
+import asyncio
+from typing import List
+
+import openai
+import structlog
+
+from core.config import settings
+from services.embedding_service import embedding_service
+
+logger = structlog.getLogger(__name__)
+
+
+class EmbeddingBatcher:
+    """Coalesces texts from concurrent requests into shared embedding calls.
+
+    Callers ``submit`` one text at a time. A background task collects pending
+    texts until ``max_batch`` are queued or ``max_wait`` seconds have passed
+    since the first one arrived, then embeds them with a single API call.
+    """
+
+    def __init__(self, max_batch: int, max_wait: float, max_concurrent: int):
+        self.max_batch = max_batch
+        self.max_wait = max_wait
+        # Caps in-flight API calls so a large upload cannot burst past the
+        # provider's rate limits
+        self._limit = asyncio.Semaphore(max_concurrent)
+        self._queue: asyncio.Queue[tuple[str, asyncio.Future]] = asyncio.Queue()
+        self._worker: asyncio.Task | None = None
+        # Keeps in-flight batch tasks referenced until they finish
+        self._batches: set[asyncio.Task] = set()
+
+    async def submit(self, text: str) -> List[float]:
+        """
+        Embed a single text as part of the next batch.
+
+        Args:
+            text: Text to embed
+
+        Returns:
+            List of floats representing the embedding vector
+        """
+        text = text.strip()
+        if not text:
+            raise ValueError("Cannot embed empty text")
+
+        if self._worker is None or self._worker.done():
+            self._worker = asyncio.create_task(self._collect())
+
+        future = asyncio.get_running_loop().create_future()
+        await self._queue.put((text, future))
+        return await future
+
+    async def _collect(self) -> None:
+        """Drain the queue into batches and hand each one off to be embedded."""
+        loop = asyncio.get_running_loop()
+        while True:
+            batch = [await self._queue.get()]
+            deadline = loop.time() + self.max_wait
+            while len(batch) < self.max_batch:
+                timeout = deadline - loop.time()
+                if timeout <= 0:
+                    break
+                try:
+                    batch.append(await asyncio.wait_for(self._queue.get(), timeout))
+                except TimeoutError:
+                    break
+
+            task = asyncio.create_task(self._embed(batch))
+            self._batches.add(task)
+            task.add_done_callback(self._batches.discard)
+
+    async def _embed(self, batch: list[tuple[str, asyncio.Future]]) -> None:
+        """Embed one batch and resolve each caller's future with its vector."""
+        # misc.utils imports the RAG service, which imports this module
+        from misc.utils import retry
+
+        texts = [text for text, _ in batch]
+        try:
+            async with self._limit:
+                embeddings = await retry(
+                    lambda: embedding_service.embed_batch(texts, batch_size=len(texts)),
+                    retry_on=(
+                        openai.RateLimitError,
+                        openai.APITimeoutError,
+                        openai.APIConnectionError,
+                    ),
+                )
+        except Exception as e:
+            for _, future in batch:
+                if not future.done():
+                    future.set_exception(e)
+            return
+
+        logger.debug("Embedded coalesced batch", size=len(texts))
+        for (_, future), embedding in zip(batch, embeddings):
+            # The caller may have been cancelled while waiting
+            if not future.done():
+                future.set_result(embedding)
+
+
+# Singleton instance
+embedding_batcher = EmbeddingBatcher(
+    max_batch=settings.EMBED_BATCH_MAX,
+    max_wait=settings.EMBED_BATCH_WAIT_MS / 1000,
+    max_concurrent=settings.EMBED_MAX_CONCURRENT_BATCHES,
+)
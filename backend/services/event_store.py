@@ -2,10 +2,10 @@
 
 import asyncio
 import contextlib
-import json
 from datetime import datetime
 from typing import Dict
 
+import orjson
 import structlog
 from sqlalchemy import bindparam, text
 from sqlalchemy.dialects.postgresql import JSONB
@@ -183,7 +183,13 @@ event_store = EventStore()
 async def store_sse_event(run_id: str, event_id: str, event_type: str, data: Dict):
     # Ensure JSON-safe data by serializing complex message objects
     try:
-        safe_data = json.loads(json.dumps(data, default=_serialize_message_object))
+        safe_data = orjson.loads(
+            orjson.dumps(
+                data,
+                default=_serialize_message_object,
+                option=orjson.OPT_NON_STR_KEYS,
+            )
+        )
     except Exception:
         # Fallback to stringifying as a last resort to avoid crashing the run
         safe_data = {"raw": str(data)}
@@ -0,0 +1,148 @@
+"""Blocking text extraction and chunking, run inside the file processing pool.
+
+Worker processes import this module on their own, so it must not import the
+app, its config or anything that opens connections; every setting arrives as
+an argument.
+"""
+
+import io
+
+import structlog
+import tiktoken
+
+logger = structlog.getLogger(__name__)
+
+SUPPORTED_TYPES = {
+    "application/pdf": "pdf",
+    "text/plain": "txt",
+    "application/vnd.openxmlformats-officedocument.wordprocessingml.document": "docx",
+    "text/markdown": "md",
+}
+
+# Loaded on the first chunking call in each worker
+_tokenizer: tiktoken.Encoding | None = None
+
+
+def _get_tokenizer() -> tiktoken.Encoding:
+    """Return this process's cl100k_base encoding (used by OpenAI embeddings)."""
+    global _tokenizer
+    if _tokenizer is None:
+        _tokenizer = tiktoken.get_encoding("cl100k_base")
+    return _tokenizer
+
+
+def extract_text(file_content: bytes, mime_type: str) -> str:
+    """Extract text from a file based on its MIME type; blocking."""
+    file_type = SUPPORTED_TYPES.get(mime_type)
+
+    if file_type == "pdf":
+        extract = _extract_pdf
+    elif file_type == "txt" or file_type == "md":
+        extract = _extract_text_file
+    elif file_type == "docx":
+        extract = _extract_docx
+    else:
+        raise ValueError(f"Unsupported file type: {mime_type}")
+
+    return extract(file_content)
+
+
+def _extract_pdf(file_content: bytes) -> str:
+    """Extract text from PDF file."""
+    try:
+        from pypdf import PdfReader
+
+        reader = PdfReader(io.BytesIO(file_content))
+        text_parts = []
+
+        for page_num, page in enumerate(reader.pages, 1):
+            page_text = page.extract_text()
+            if page_text:
+                text_parts.append(f"[Page {page_num}]\n{page_text}")
+
+        return "\n\n".join(text_parts)
+    except Exception as e:
+        logger.error(f"Failed to extract PDF: {e}")
+        raise ValueError(f"Failed to extract PDF content: {str(e)}")
+
+
+def _extract_text_file(file_content: bytes) -> str:
+    """Extract text from plain text or markdown file."""
+    try:
+        # Try UTF-8 first, then fall back to other encodings
+        for encoding in ["utf-8", "utf-8-sig", "latin-1", "cp1252"]:
+            try:
+                return file_content.decode(encoding)
+            except UnicodeDecodeError:
+                continue
+        raise ValueError("Could not decode file with any supported encoding")
+    except Exception as e:
+        logger.error(f"Failed to extract text file: {e}")
+        raise ValueError(f"Failed to extract text content: {str(e)}")
+
+
+def _extract_docx(file_content: bytes) -> str:
+    """Extract text from DOCX file."""
+    try:
+        from docx import Document
+
+        doc = Document(io.BytesIO(file_content))
+        text_parts = []
+
+        for para in doc.paragraphs:
+            if para.text.strip():
+                text_parts.append(para.text)
+
+        # Also extract text from tables
+        for table in doc.tables:
+            for row in table.rows:
+                row_text = " | ".join(
+                    cell.text.strip() for cell in row.cells if cell.text.strip()
+                )
+                if row_text:
+                    text_parts.append(row_text)
+
+        return "\n\n".join(text_parts)
+    except Exception as e:
+        logger.error(f"Failed to extract DOCX: {e}")
+        raise ValueError(f"Failed to extract DOCX content: {str(e)}")
+
+
+def chunk_text(text: str, chunk_size: int, chunk_overlap: int) -> list[tuple[str, int]]:
+    """Split text into overlapping chunks by token count; blocking."""
+    if not text.strip():
+        return []
+
+    # Tokenize the entire text
+    tokenizer = _get_tokenizer()
+    tokens = tokenizer.encode(text)
+    total_tokens = len(tokens)
+
+    if total_tokens <= chunk_size:
+        return [(text, total_tokens)]
+
+    chunks = []
+    start = 0
+
+    while start < total_tokens:
+        # Get chunk tokens
+        end = min(start + chunk_size, total_tokens)
+        chunk_tokens = tokens[start:end]
+
+        # Decode tokens back to text
+        chunk = tokenizer.decode(chunk_tokens)
+        chunks.append((chunk.strip(), len(chunk_tokens)))
+
+        # Move start position with overlap
+        start = end - chunk_overlap
+
+        # Prevent infinite loop at the end
+        if start >= total_tokens - chunk_overlap:
+            break
+
+    logger.info(
+        f"Chunked text into {len(chunks)} chunks "
+        f"(total tokens: {total_tokens}, chunk_size: {chunk_size})"
+    )
+
+    return chunks
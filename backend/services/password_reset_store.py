@@ -1,143 +1,120 @@
 """
-In-memory store for password reset verification codes.
-Codes expire after a configurable time and are cleaned up automatically.
-Thread-safe for concurrent access.
+Database-backed store for password reset verification codes.
+Codes live in the password_reset_code table so every worker sees them, and
+expire after a configurable time.
 """
-import asyncio
 import logging
 import secrets
 import string
-from datetime import datetime, timedelta, timezone
-from typing import Dict, Optional
-from dataclasses import dataclass
+from datetime import timedelta
 
-logger = logging.getLogger(__name__)
+from sqlalchemy import delete, func, update
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from core.database import db_manager
+from core.orm import PasswordResetCode
 
+logger = logging.getLogger(__name__)
 
-@dataclass
-class ResetCodeEntry:
-    email: str
-    code: str
-    created_at: datetime
-    expires_at: datetime
-    verified: bool = False
+# Uppercase letters and digits without the ambiguous 0, O, I, 1 and L
+CODE_CHARACTERS = "".join(
+    c for c in string.ascii_uppercase + string.digits if c not in "0OI1L"
+)
 
 
 class PasswordResetStore:
     """
-    In-memory store for managing password reset verification codes.
+    Store for managing password reset verification codes.
     Codes are 6 characters (alphanumeric) and expire after a configurable time.
-    Thread-safe using asyncio Lock.
+    Each operation is a single statement, so concurrent requests on any worker
+    see a consistent state without locking.
     """
 
     def __init__(self, expiry_minutes: int = 10):
-        self._store: Dict[str, ResetCodeEntry] = {}  # email -> ResetCodeEntry
-        self._code_to_email: Dict[str, str] = {}  # code -> email (for quick lookup)
-        self.expiry_minutes = expiry_minutes
-        self._lock = asyncio.Lock()  # Thread-safe lock for concurrent access
+        self.expiry = timedelta(minutes=expiry_minutes)
 
     def _generate_code(self) -> str:
         """Generate a 6-character alphanumeric code (uppercase for clarity)."""
-        characters = string.ascii_uppercase + string.digits
-        # Remove ambiguous characters (0, O, I, 1, L)
-        characters = characters.replace("0", "").replace("O", "").replace("I", "").replace("1", "").replace("L", "")
-        return "".join(secrets.choice(characters) for _ in range(6))
-
-    def _cleanup_expired(self) -> None:
-        """Remove expired entries (must be called within lock)."""
-        now = datetime.now(timezone.utc)
-        expired_emails = [
-            email for email, entry in self._store.items() if entry.expires_at < now
-        ]
-        for email in expired_emails:
-            entry = self._store.pop(email, None)
-            if entry:
-                self._code_to_email.pop(entry.code, None)
-                logger.info(f"Cleaned up expired code for {email}")
+        return "".join(secrets.choice(CODE_CHARACTERS) for _ in range(6))
 
     async def create_reset_code(self, email: str) -> str:
         """
         Create a new reset code for the given email.
         If a code already exists for this email, it will be replaced.
-        Thread-safe.
         """
-        async with self._lock:
-            self._cleanup_expired()
-
-            # Remove existing code for this email if any
-            if email in self._store:
-                old_entry = self._store.pop(email)
-                self._code_to_email.pop(old_entry.code, None)
-                logger.info(f"Invalidated previous code for {email}")
-
-            # Generate new code (ensure uniqueness)
-            code = self._generate_code()
-            while code in self._code_to_email:
-                code = self._generate_code()
-
-            now = datetime.now(timezone.utc)
-            entry = ResetCodeEntry(
-                email=email,
-                code=code,
-                created_at=now,
-                expires_at=now + timedelta(minutes=self.expiry_minutes),
-                verified=False,
+        code = self._generate_code()
+        expires_at = func.now() + self.expiry
+        stmt = pg_insert(PasswordResetCode).values(
+            email=email, code=code, verified=False, expires_at=expires_at
+        )
+        async with AsyncSession(db_manager.get_engine()) as session:
+            # Piggyback cleanup of abandoned codes on new requests
+            await session.execute(
+                delete(PasswordResetCode).where(
+                    PasswordResetCode.expires_at < func.now()
+                )
             )
+            await session.execute(
+                stmt.on_conflict_do_update(
+                    index_elements=[PasswordResetCode.email],
+                    set_={"code": code, "verified": False, "expires_at": expires_at},
+                )
+            )
+            await session.commit()
 
-            self._store[email] = entry
-            self._code_to_email[code] = email
-            logger.info(f"Created reset code for {email}")
-
-            return code
+        logger.info(f"Created reset code for {email}")
+        return code
 
     async def verify_code(self, email: str, code: str) -> bool:
         """
         Verify the code for the given email.
         Returns True if valid, False otherwise.
         Marks the code as verified if successful.
-        Thread-safe.
         """
-        async with self._lock:
-            self._cleanup_expired()
-
-            entry = self._store.get(email)
-            if not entry:
-                logger.warning(f"No reset code found for {email}")
-                return False
-
-            if entry.code.upper() != code.upper():
-                logger.warning(f"Invalid code for {email}")
-                return False
+        async with AsyncSession(db_manager.get_engine()) as session:
+            verified = await session.scalar(
+                update(PasswordResetCode)
+                .where(
+                    PasswordResetCode.email == email,
+                    PasswordResetCode.code == code.upper(),
+                    PasswordResetCode.expires_at > func.now(),
+                )
+                .values(verified=True)
+                .returning(PasswordResetCode.email)
+            )
+            await session.commit()
 
-            if entry.expires_at < datetime.now(timezone.utc):
-                logger.warning(f"Expired reset code for {email}")
-                return False
+        if verified is None:
+            logger.warning(f"Invalid or expired reset code for {email}")
+            return False
 
-            # Mark as verified
-            entry.verified = True
-            logger.info(f"Code verified for {email}")
-            return True
+        logger.info(f"Code verified for {email}")
+        return True
 
     async def consume_verified(self, email: str) -> bool:
         """
         Check if email is verified and remove the entry.
         Returns True if was verified, False otherwise.
         Used when actually resetting the password.
-        Thread-safe.
         """
-        async with self._lock:
-            self._cleanup_expired()
-            entry = self._store.get(email)
-            if entry and entry.verified:
-                self._store.pop(email, None)
-                self._code_to_email.pop(entry.code, None)
-                logger.info(f"Consumed verified code for {email}")
-                return True
+        async with AsyncSession(db_manager.get_engine()) as session:
+            consumed = await session.scalar(
+                delete(PasswordResetCode)
+                .where(
+                    PasswordResetCode.email == email,
+                    PasswordResetCode.verified,
+                    PasswordResetCode.expires_at > func.now(),
+                )
+                .returning(PasswordResetCode.email)
+            )
+            await session.commit()
+
+        if consumed is None:
             return False
 
-    def get_email_by_code(self, code: str) -> Optional[str]:
-        """Get email associated with a code (for verification endpoint)."""
-        return self._code_to_email.get(code.upper())
+        logger.info(f"Consumed verified code for {email}")
+        return True
 
 
 # Global instance
@@ -1,16 +1,18 @@
 """RAG service for similarity search using pgvector."""
 
+from collections import OrderedDict
 from typing import List, Optional
 
 import structlog
 from pgvector.sqlalchemy import Vector
-from sqlalchemy import func, select
+from sqlalchemy import func, select, text
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from core.config import settings
 from core.orm import FileChunk, FileUpload
 from models.files import ChunkResult
-from services.embedding_service import embedding_service
+from services.embedding_batcher import embedding_batcher
+from services.semantic_cache import semantic_cache
 
 logger = structlog.getLogger(__name__)
 
@@ -21,6 +23,31 @@ class RAGService:
     def __init__(self):
         self.top_k = settings.TOP_K_RESULTS
         self.similarity_threshold = settings.SIMILARITY_THRESHOLD
+        self.ef_search = settings.HNSW_EF_SEARCH
+        # LRU of query embeddings keyed by whitespace-normalized query text
+        self._query_embeddings: OrderedDict[str, List[float]] = OrderedDict()
+
+    async def embed_query(self, query: str) -> List[float]:
+        """
+        Embed a search query, reusing the vector of a recently seen query.
+
+        Args:
+            query: Query text
+
+        Returns:
+            The query's embedding vector
+        """
+        key = " ".join(query.split())
+        embedding = self._query_embeddings.get(key)
+        if embedding is not None:
+            self._query_embeddings.move_to_end(key)
+            return embedding
+
+        embedding = await embedding_batcher.submit(key)
+        self._query_embeddings[key] = embedding
+        if len(self._query_embeddings) > settings.QUERY_EMBED_CACHE_SIZE:
+            self._query_embeddings.popitem(last=False)
+        return embedding
 
     async def search_similar_chunks(
         self,
@@ -45,7 +72,12 @@ class RAGService:
 
         try:
             # Generate embedding for the query
-            query_embedding = await embedding_service.embed_text(query)
+            query_embedding = await self.embed_query(query)
+
+            # Reuse the results of a near-identical recent query
+            cached = semantic_cache.get(thread_id, top_k, query_embedding)
+            if cached is not None:
+                return cached
 
             # Use SQLAlchemy ORM with pgvector's cosine_distance function
             # cosine_distance returns distance, so 1 - distance = similarity
@@ -70,9 +102,21 @@ class RAGService:
                 .limit(top_k)
             )
 
+            # Scoped to this transaction. Iterative scans keep walking the
+            # HNSW graph until enough rows pass the thread filter, at the cost
+            # of slightly out-of-order results, so the rows are re-sorted below.
+            await session.execute(
+                text(
+                    "SELECT set_config('hnsw.ef_search', :ef_search, true), "
+                    "set_config('hnsw.iterative_scan', 'relaxed_order', true)"
+                ),
+                {"ef_search": str(self.ef_search)},
+            )
             result = await session.execute(stmt)
 
-            rows = result.fetchall()
+            rows = sorted(
+                result.fetchall(), key=lambda row: row.similarity_score, reverse=True
+            )
 
             # Filter by similarity threshold and convert to ChunkResult
             chunks = []
@@ -93,6 +137,7 @@ class RAGService:
             logger.info(
                 f"Found {len(chunks)} relevant chunks for query in thread {thread_id}"
             )
+            semantic_cache.put(thread_id, top_k, query_embedding, chunks)
             return chunks
 
         except Exception as e:
@@ -0,0 +1,163 @@
+"""Semantic cache of similarity-search results for near-duplicate queries."""
+
+import itertools
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any, List, Optional
+
+import numpy as np
+
+from core.config import settings
+
+
+@dataclass(slots=True)
+class _Entry:
+    thread_id: str
+    top_k: int
+    vector: np.ndarray
+    signatures: list[bytes]
+    results: List[Any]
+    expires_at: float
+
+
+class SemanticCache:
+    """Reuses search results of earlier queries whose embeddings are close.
+
+    Candidates are found with random-projection LSH: each of ``tables`` hash
+    tables buckets a query by the signs of its projections onto ``bits``
+    random hyperplanes. A hit requires a candidate for the same thread and
+    ``top_k`` with cosine similarity of at least ``threshold``.
+
+    Entries are scoped to a thread and dropped by ``invalidate`` when its
+    files change. They also expire after ``ttl`` seconds, which bounds
+    staleness in workers that did not see the change.
+    """
+
+    def __init__(
+        self,
+        dimension: int,
+        tables: int,
+        bits: int,
+        threshold: float,
+        max_entries: int,
+        ttl: float,
+    ):
+        self.tables = tables
+        self.bits = bits
+        self.threshold = threshold
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self._planes = np.random.default_rng(0).standard_normal(
+            (tables * bits, dimension), dtype=np.float32
+        )
+        # Insertion-ordered so the oldest entry is evicted first
+        self._entries: OrderedDict[int, _Entry] = OrderedDict()
+        # thread_id -> one {signature: entry ids} table per hash table
+        self._buckets: dict[str, list[dict[bytes, set[int]]]] = {}
+        self._ids = itertools.count()
+
+    def _signatures(self, vector: np.ndarray) -> list[bytes]:
+        """Hash a unit vector into one bucket signature per table."""
+        signs = (self._planes @ vector > 0).reshape(self.tables, self.bits)
+        return [row.tobytes() for row in np.packbits(signs, axis=1)]
+
+    @staticmethod
+    def _normalize(embedding: List[float]) -> np.ndarray:
+        vector = np.asarray(embedding, dtype=np.float32)
+        return vector / (np.linalg.norm(vector) or 1.0)
+
+    def get(
+        self, thread_id: str, top_k: int, embedding: List[float]
+    ) -> Optional[List[Any]]:
+        """
+        Look up results cached for a query close to ``embedding``.
+
+        Args:
+            thread_id: Thread the search is scoped to
+            top_k: Number of results requested
+            embedding: Query embedding
+
+        Returns:
+            The cached results of the most similar query, or None on a miss
+        """
+        buckets = self._buckets.get(thread_id)
+        if buckets is None:
+            return None
+
+        vector = self._normalize(embedding)
+        candidates = set()
+        for table, signature in zip(buckets, self._signatures(vector)):
+            candidates.update(table.get(signature, ()))
+
+        now = time.monotonic()
+        best, best_similarity = None, self.threshold
+        for entry_id in candidates:
+            entry = self._entries[entry_id]
+            if entry.top_k != top_k or entry.expires_at <= now:
+                continue
+            similarity = float(entry.vector @ vector)
+            if similarity >= best_similarity:
+                best, best_similarity = entry, similarity
+        return best.results if best is not None else None
+
+    def put(
+        self, thread_id: str, top_k: int, embedding: List[float], results: List[Any]
+    ) -> None:
+        """
+        Cache the results of a search.
+
+        Args:
+            thread_id: Thread the search was scoped to
+            top_k: Number of results requested
+            embedding: Query embedding
+            results: Results to return for similar queries
+        """
+        vector = self._normalize(embedding)
+        entry = _Entry(
+            thread_id=thread_id,
+            top_k=top_k,
+            vector=vector,
+            signatures=self._signatures(vector),
+            results=results,
+            expires_at=time.monotonic() + self.ttl,
+        )
+        entry_id = next(self._ids)
+        self._entries[entry_id] = entry
+        buckets = self._buckets.setdefault(thread_id, [{} for _ in range(self.tables)])
+        for table, signature in zip(buckets, entry.signatures):
+            table.setdefault(signature, set()).add(entry_id)
+
+        while len(self._entries) > self.max_entries:
+            self._evict(*self._entries.popitem(last=False))
+
+    def _evict(self, entry_id: int, entry: _Entry) -> None:
+        """Remove an entry from its thread's hash tables."""
+        buckets = self._buckets[entry.thread_id]
+        for table, signature in zip(buckets, entry.signatures):
+            ids = table[signature]
+            ids.discard(entry_id)
+            if not ids:
+                del table[signature]
+        if not any(buckets):
+            del self._buckets[entry.thread_id]
+
+    def invalidate(self, thread_id: str) -> None:
+        """Drop every cached search for a thread, e.g. after its files change."""
+        buckets = self._buckets.pop(thread_id, None)
+        if buckets is None:
+            return
+        for ids in buckets[0].values():
+            for entry_id in ids:
+                self._entries.pop(entry_id, None)
+
+
+# Singleton instance
+semantic_cache = SemanticCache(
+    dimension=settings.EMBEDDING_DIMENSION,
+    tables=settings.SEMANTIC_CACHE_L,
+    bits=settings.SEMANTIC_CACHE_B,
+    threshold=settings.SEMANTIC_CACHE_THRESHOLD,
+    max_entries=settings.SEMANTIC_CACHE_SIZE,
+    ttl=settings.SEMANTIC_CACHE_TTL_SECONDS,
+)
@@ -56,17 +56,21 @@ class StreamingService:
                 self.event_counters[run_id] = idx
                 return idx
         except Exception as e:
-            logger.warning(f"Event counter update failed: {e}")
+            logger.warning("Event counter update failed", error=str(e))
         return self.event_counters.get(run_id, 0)
 
-    async def put_to_broker(
+    async def publish_event(
         self,
         run_id: str,
         event_id: str,
         raw_event: Any,
         only_interrupt_updates: bool = False,
     ):
-        """Put an event into the run's broker queue for live consumers"""
+        """Put an event into the run's broker queue and store it for replay.
+
+        Interrupt filtering runs once for both, and live consumers get the
+        event before the database write.
+        """
         broker = broker_manager.get_or_create_broker(run_id)
         self._next_event_counter(run_id, event_id)
 
@@ -77,21 +81,10 @@ class StreamingService:
             return
 
         await broker.put(event_id, processed_event)
+        await self._store_event(run_id, event_id, processed_event)
 
-    async def store_event_from_raw(
-        self,
-        run_id: str,
-        event_id: str,
-        raw_event: Any,
-        only_interrupt_updates: bool = False,
-    ):
-        """Convert raw event to stored format and store it"""
-        processed_event, should_skip = self._process_interrupt_updates(
-            raw_event, only_interrupt_updates
-        )
-        if should_skip:
-            return
-
+    async def _store_event(self, run_id: str, event_id: str, processed_event: Any):
+        """Convert a processed event to stored format and store it"""
         # Parse the processed event
         node_path = None
         stream_mode_label = None
@@ -201,12 +194,12 @@ class StreamingService:
                 yield sse_event
 
         except asyncio.CancelledError:
-            logger.debug(f"Stream cancelled for run {run_id}")
+            logger.debug("Stream cancelled", run_id=run_id)
             if cancel_on_disconnect:
                 self._cancel_background_task(run_id)
             raise
         except Exception as e:
-            logger.error(f"Error in stream_run_execution for run {run_id}: {e}")
+            logger.error("Error in stream_run_execution", run_id=run_id, error=str(e))
             yield create_error_event(str(e))
 
     async def _replay_stored_events(
@@ -260,7 +253,9 @@ class StreamingService:
                 task.cancel()
         except Exception as e:
             logger.warning(
-                f"Failed to cancel background task for run {run_id} on disconnect: {e}"
+                "Failed to cancel background task on disconnect",
+                run_id=run_id,
+                error=str(e),
             )
 
     async def _convert_raw_to_sse(self, event_id: str, raw_event: Any) -> str | None:
@@ -274,7 +269,7 @@ class StreamingService:
             await self._update_run_status(run_id, "interrupted")
             return True
         except Exception as e:
-            logger.error(f"Error interrupting run {run_id}: {e}")
+            logger.error("Error interrupting run", run_id=run_id, error=str(e))
             return False
 
     async def cancel_run(self, run_id: str) -> bool:
@@ -284,7 +279,7 @@ class StreamingService:
             await self._update_run_status(run_id, "cancelled")
             return True
         except Exception as e:
-            logger.error(f"Error cancelling run {run_id}: {e}")
+            logger.error("Error cancelling run", run_id=run_id, error=str(e))
             return False
 
     async def _update_run_status(
@@ -297,7 +292,7 @@ class StreamingService:
 
             await update_run_status(run_id, status, output, error)
         except Exception as e:
-            logger.error(f"Error updating run status for {run_id}: {e}")
+            logger.error("Error updating run status", run_id=run_id, error=str(e))
 
     def is_run_streaming(self, run_id: str) -> bool:
         """Check if run is currently active (has a broker)"""
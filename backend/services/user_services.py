@@ -3,11 +3,15 @@ from http.client import HTTPException
 from typing import Any
 
 
-from core.security import get_password_hash, verify_password
+from core.security import (
+    get_password_hash,
+    password_needs_rehash,
+    verify_password,
+)
 from models.users import UserCreate, UserBase, UserUpdateMe
 from core.orm import User as UserORM
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select, update
+from sqlalchemy import exists, select, update
 
 
 class UserService:
@@ -28,26 +32,31 @@ class UserService:
         return UserBase.model_validate(db_obj, from_attributes=True)
 
     async def update_user(self, db_user: UserBase, user_in: UserUpdateMe) -> Any:
-        stmt = select(UserORM).where(
-            UserORM.user_id == db_user.user_id,
-        )
-        user = await self.session.scalar(stmt)
-        if not user:
-            raise HTTPException(404, f"User '{UserORM.user_id}' not found")
-
-        user_update = (
-            update(UserORM)
-            .where(UserORM.user_id == db_user.user_id)
-            .values(
-                name=user_in.name if user_in.name else user.name,
-                email=user_in.email if user_in.email else user.email,
+        # Empty fields leave the current value in place
+        values = {k: v for k, v in user_in.model_dump().items() if v}
+        if not values:
+            stmt = select(UserORM).where(UserORM.user_id == db_user.user_id)
+            user = await self.session.scalar(stmt)
+        else:
+            # Apply the update and read the row back in one statement
+            stmt = (
+                update(UserORM)
+                .where(UserORM.user_id == db_user.user_id)
+                .values(**values)
+                .returning(UserORM)
             )
-        )
+            user = await self.session.scalar(stmt)
+            await self.session.commit()
+        if not user:
+            raise HTTPException(404, f"User '{db_user.user_id}' not found")
+        return user
 
-        await self.session.execute(user_update)
-        await self.session.commit()
-        updated_user = await self.session.scalar(stmt)
-        return updated_user
+    async def email_taken(self, email: str, exclude_user_id: str) -> bool:
+        """Return whether another user already has ``email``."""
+        statement = select(
+            exists().where(UserORM.email == email, UserORM.user_id != exclude_user_id)
+        )
+        return await self.session.scalar(statement)
 
     async def get_user_by_email(self, email: str) -> UserBase | None:
         statement = select(UserORM).where(UserORM.email == email)
@@ -60,4 +69,9 @@ class UserService:
             return None
         if not verify_password(password, db_user.password):
             return None
+        if password_needs_rehash(db_user.password):
+            # Move the stored hash to the current scheme while the plain
+            # password is at hand
+            db_user.password = get_password_hash(password)
+            await self.session.commit()
         return UserBase.model_validate(db_user, from_attributes=True)
@@ -1,3 +1,5 @@
+import time
+from collections import OrderedDict
 from collections.abc import Generator
 from typing import Annotated
 
@@ -26,8 +28,26 @@ async def get_db() -> Generator[AsyncSession, None, None]:
 SessionDep = Annotated[AsyncSession, Depends(get_db)]
 TokenDep = Annotated[str, Depends(reusable_oauth2)]
 
+# Authenticated users keyed by raw token, so repeat requests skip the JWT decode
+# and user lookup. Entries never outlive the token; user_routes evicts a user's
+# entries when the account changes. Values are (expires_at, user).
+_user_cache: OrderedDict[str, tuple[float, User]] = OrderedDict()
+
+
+def invalidate_user_cache(user_id: str) -> None:
+    """Drop every cached token that resolves to ``user_id``."""
+    for token in [t for t, (_, u) in _user_cache.items() if u.user_id == user_id]:
+        del _user_cache[token]
+
 
 async def get_current_user(session: SessionDep, token: TokenDep) -> User:
+    now = time.time()
+    cached = _user_cache.get(token)
+    if cached is not None and cached[0] > now:
+        _user_cache.move_to_end(token)
+        # Handlers may modify the user they get, so hand out a copy
+        return cached[1].model_copy()
+
     try:
         payload = jwt.decode(
             token, settings.SECRET_KEY, algorithms=[security.ALGORITHM]
@@ -44,4 +64,13 @@ async def get_current_user(session: SessionDep, token: TokenDep) -> User:
     user = await session.scalar(stmt)
     if not user:
         raise HTTPException(status_code=404, detail="User not found")
-    return User.model_validate(user, from_attributes=True)
+    current_user = User.model_validate(user, from_attributes=True)
+
+    expires_at = now + settings.USER_CACHE_TTL_SECONDS
+    if "exp" in payload:
+        expires_at = min(expires_at, payload["exp"])
+    _user_cache[token] = (expires_at, current_user)
+    _user_cache.move_to_end(token)
+    if len(_user_cache) > settings.USER_CACHE_SIZE:
+        _user_cache.popitem(last=False)
+    return current_user.model_copy()